@@ -21,6 +21,7 @@ Access logs.
 __all__ = [
     "DirectoryLogWrapperResource",
     "RotatingFileAccessLoggingObserver",
+    "AsyncAccessLoggingObserver",
     "AMPCommonAccessLoggingObserver",
     "AMPLoggingFactory",
 ]
@@ -29,6 +30,7 @@ import collections
 import datetime
 import json
 import os
+import threading
 try:
     import psutil
 except ImportError:
@@ -589,6 +591,66 @@ class RotatingFileAccessLoggingObserver(CommonAccessLoggingObserverExtensions):
             current["T-RESP-WR"][bin] += stats["T-RESP-WR"][bin]
 
 
+class AsyncAccessLoggingObserver(RotatingFileAccessLoggingObserver):
+    """
+    A L{RotatingFileAccessLoggingObserver} which queues messages in a bounded
+    in-memory ring and writes them from a dedicated thread, so access logging
+    never performs file I/O on the reactor thread.  If the writer thread
+    cannot keep up the oldest queued messages are dropped rather than
+    stalling the reactor.
+    """
+
+    maxQueueLength = 32768
+
+    def __init__(self, logpath):
+        RotatingFileAccessLoggingObserver.__init__(self, logpath)
+        self._queue = collections.deque(maxlen=self.maxQueueLength)
+        self._event = threading.Event()
+        self._thread = None
+        self._running = False
+
+    def accessLog(self, message, allowrotate=True):
+        if self._running and threading.currentThread() is not self._thread:
+            self._queue.append((message, allowrotate))
+            self._event.set()
+        else:
+            # Either logging before start()/after stop(), or we are on the
+            # writer thread itself (e.g. rotation messages); write directly
+            RotatingFileAccessLoggingObserver.accessLog(
+                self, message, allowrotate
+            )
+
+    def start(self):
+        RotatingFileAccessLoggingObserver.start(self)
+        self._running = True
+        self._thread = threading.Thread(target=self._writeLoop)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if self._running:
+            self._running = False
+            self._event.set()
+            self._thread.join(2.0)
+            self._thread = None
+        RotatingFileAccessLoggingObserver.stop(self)
+
+    def _writeLoop(self):
+        while True:
+            self._event.wait(0.05)
+            self._event.clear()
+            while True:
+                try:
+                    message, allowrotate = self._queue.popleft()
+                except IndexError:
+                    break
+                RotatingFileAccessLoggingObserver.accessLog(
+                    self, message, allowrotate
+                )
+            if not self._running:
+                break
+
+
 class SystemMonitor(object):
     """
     Keeps track of system usage information. This installs a reactor task to
@@ -649,6 +711,14 @@ class AMPCommonAccessLoggingObserver(CommonAccessLoggingObserverExtensions):
     def __init__(self):
         self.protocol = None
         self._buffer = []
+        # A single AmpBox reused for every record: access logging is
+        # fire-and-forget, so instead of callRemote() -- which allocates a
+        # fresh box and a pending-answer Deferred per line, and costs a reply
+        # box from the master -- we fill in this box and send it directly.
+        # With no _ask key the master's responder runs without sending an
+        # answer.
+        self._scratchBox = amp.AmpBox()
+        self._scratchBox[amp.COMMAND] = "LogStats"
 
     def flushBuffer(self):
         if self._buffer:
@@ -668,11 +738,17 @@ class AMPCommonAccessLoggingObserver(CommonAccessLoggingObserverExtensions):
         """
 
         if self.protocol is not None:
-            message = json.dumps(message)
+            # Compact separators shave whitespace off every record sent over
+            # the wire; access logging is the highest-frequency IPC we do
+            message = json.dumps(message, separators=(",", ":"))
             if isinstance(message, unicode):
                 message = message.encode("utf-8")
-            d = self.protocol.callRemote(LogStats, message=message)
-            d.addErrback(log.error)
+            box = self._scratchBox
+            box["message"] = message
+            try:
+                self.protocol.sendBox(box)
+            except Exception, e:
+                log.error(e)
         else:
             self._buffer.append(message)
 
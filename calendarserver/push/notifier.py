@@ -25,7 +25,7 @@ from twext.enterprise.jobs.workitem import WorkItem, WORK_PRIORITY_HIGH, \
     WORK_WEIGHT_1
 from twext.python.log import Logger
 
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import inlineCallbacks, succeed
 
 from txdav.common.datastore.sql_tables import schema
 from txdav.idav import IStoreNotifierFactory, IStoreNotifier
@@ -265,3 +265,74 @@ class PushDistributor(object):
             yield observer.enqueue(
                 transaction, pushKey,
                 dataChangedTimestamp=None, priority=priority)
+
+
+class BatchingPushDistributor(PushDistributor):
+    """
+    A L{PushDistributor} which coalesces enqueued push keys in memory over a
+    short window, delivering at most one notification per key per window at
+    the highest priority seen.  When a single write invalidates many
+    subscribers this absorbs the burst, and the flush shares one transaction
+    across all the observers' subscription lookups.
+    """
+
+    def __init__(self, observers, store, windowSeconds, reactor=None):
+        """
+        @param observers: the list of observers to distribute pushKeys to
+        @type observers: C{list}
+
+        @param store: used to create the transaction the flush runs in
+        @type store: L{CommonDataStore}
+
+        @param windowSeconds: how long to coalesce before flushing
+        @type windowSeconds: C{float}
+        """
+        PushDistributor.__init__(self, observers)
+        self.store = store
+        self.windowSeconds = windowSeconds
+        self._pending = {}
+        self._flushCall = None
+        if reactor is None:
+            from twisted.internet import reactor
+        self._reactor = reactor
+
+    def enqueue(self, transaction, pushKey, priority=PushPriority.high):
+        """
+        Record the pushKey and (highest) priority; delivery happens when the
+        coalescing window closes.
+
+        @param transaction: ignored; the flush uses its own transaction
+        @type transaction: L{CommonStoreTransaction}
+
+        @param pushKey: the push key to distribute to the observers
+        @type pushKey: C{str}
+
+        @param priority: the priority level
+        @type priority: L{PushPriority}
+        """
+        seen = self._pending.get(pushKey)
+        if seen is None or priority.value > seen.value:
+            self._pending[pushKey] = priority
+        if self._flushCall is None:
+            self._flushCall = self._reactor.callLater(
+                self.windowSeconds, self._flush
+            )
+        return succeed(None)
+
+    @inlineCallbacks
+    def _flush(self):
+        self._flushCall = None
+        pending, self._pending = self._pending, {}
+        txn = self.store.newTransaction(
+            label="BatchingPushDistributor._flush"
+        )
+        try:
+            for pushKey, priority in pending.iteritems():
+                yield PushDistributor.enqueue(
+                    self, txn, pushKey, priority=priority
+                )
+        except Exception, e:
+            log.error("Push distribution failed: {ex}", ex=e)
+            yield txn.abort()
+        else:
+            yield txn.commit()
@@ -23,9 +23,19 @@ __all__ = [
 ]
 
 import sys
-from collections import OrderedDict
-from os import getuid, getgid, geteuid, umask, remove, environ, stat, chown, W_OK
-from os.path import exists, basename
+import threading
+from collections import deque
+from os import access, getuid, getgid, geteuid, umask, remove, environ, lstat, chown, dup2, W_OK
+from os.path import exists, basename, isdir
+from os.path import join as joinpath
+
+try:
+    # PEP 446 interpreters create file descriptors non-inheritable by
+    # default; inherited listening sockets must be marked explicitly.
+    from os import set_inheritable
+except ImportError:
+    set_inheritable = None
+import select
 import signal
 import socket
 from stat import S_ISSOCK
@@ -49,6 +59,7 @@ from twisted.plugin import IPlugin
 from twisted.internet.defer import (
     gatherResults, Deferred, inlineCallbacks, succeed
 )
+from twisted.internet.task import LoopingCall
 from twisted.internet.endpoints import UNIXClientEndpoint, TCP4ClientEndpoint
 from twisted.internet.process import ProcessExitedAlready
 from twisted.internet.protocol import ProcessProtocol
@@ -80,40 +91,25 @@ from txweb2.channel.http import (
     LimitingHTTPFactory, SSLRedirectRequest, HTTPChannel
 )
 from txweb2.metafd import ConnectionLimiter, ReportingHTTPService
-from txweb2.server import Site
+from txweb2.server import Request, Site
 
 from txdav.base.datastore.dbapiclient import DBAPIConnector
-from txdav.caldav.datastore.scheduling.imip.inbound import MailRetriever
-from txdav.caldav.datastore.scheduling.imip.inbound import scheduleNextMailPoll
-from txdav.common.datastore.upgrade.migrate import UpgradeToDatabaseStep
-from txdav.common.datastore.upgrade.sql.upgrade import (
-    UpgradeDatabaseCalendarDataStep, UpgradeDatabaseOtherStep,
-    UpgradeDatabaseSchemaStep, UpgradeDatabaseAddressBookDataStep,
-    UpgradeAcquireLockStep, UpgradeReleaseLockStep,
-    UpgradeDatabaseNotificationDataStep
-)
 from txdav.common.datastore.work.inbox_cleanup import InboxCleanupWork
 from txdav.common.datastore.work.revision_cleanup import FindMinValidRevisionWork
 from txdav.who.groups import GroupCacher
 
 from twistedcaldav import memcachepool
-from twistedcaldav.cache import MemcacheURLPatternChangeNotifier
 from twistedcaldav.config import ConfigurationError
 from twistedcaldav.localization import processLocalizationFiles
 from twistedcaldav.stdconfig import DEFAULT_CONFIG, DEFAULT_CONFIG_FILE
-from twistedcaldav.upgrade import (
-    UpgradeFileSystemFormatStep, PostDBImportStep,
-)
 
 from calendarserver.accesslog import AMPCommonAccessLoggingObserver
 from calendarserver.accesslog import AMPLoggingFactory
-from calendarserver.accesslog import RotatingFileAccessLoggingObserver
+from calendarserver.accesslog import AsyncAccessLoggingObserver
 from calendarserver.controlsocket import ControlSocket
 from calendarserver.controlsocket import ControlSocketConnectingService
 from calendarserver.dashboard_service import DashboardServer
-from calendarserver.push.amppush import AMPPushMaster, AMPPushForwarder
-from calendarserver.push.applepush import ApplePushNotifierService, APNPurgingWork
-from calendarserver.push.notifier import PushDistributor
+from calendarserver.push.notifier import BatchingPushDistributor, PushDistributor
 from calendarserver.tap.util import (
     ConnectionDispenser, Stepper,
     checkDirectories, getRootResource,
@@ -132,19 +128,37 @@ except ImportError:
     from version import version as getVersion
     version = "{} ({}*)".format(getVersion())
 
-from txweb2.server import VERSION as TWISTED_VERSION
-TWISTED_VERSION = "CalendarServer/{} {}".format(
-    version.replace(" ", ""), TWISTED_VERSION,
-)
+from txweb2.server import VERSION as _TXWEB2_VERSION
+
+TWISTED_VERSION = None
+
+
+def serverVersionBanner():
+    """
+    The combined CalendarServer/Twisted version banner, formatted on first
+    use rather than at module import.
+    """
+    global TWISTED_VERSION
+    if TWISTED_VERSION is None:
+        TWISTED_VERSION = "CalendarServer/{} {}".format(
+            version.replace(" ", ""), _TXWEB2_VERSION,
+        )
+    return TWISTED_VERSION
 
 log = Logger()
 
 
-# Control socket message-routing constants.
-_LOG_ROUTE = "log"
-_QUEUE_ROUTE = "queue"
+# Invariant for the life of the process; computed once rather than per
+# makeService call.
+_EXEC_NAME = basename(sys.argv[0])
+
+
+# Control socket message-routing constants.  Interned so the AMP routing
+# table and service-name lookups they key can compare by identity.
+_LOG_ROUTE = intern("log")
+_QUEUE_ROUTE = intern("queue")
 
-_CONTROL_SERVICE_NAME = "control"
+_CONTROL_SERVICE_NAME = intern("control")
 
 
 def getid(uid, gid):
@@ -155,7 +169,7 @@ def getid(uid, gid):
     return (uid, gid)
 
 
-def conflictBetweenIPv4AndIPv6():
+def conflictBetweenIPv4AndIPv6(_cache=[]):
     """
     Is there a conflict between binding an IPv6 and an IPv4 port?  Return True
     if there is, False if there isn't.
@@ -163,8 +177,14 @@ def conflictBetweenIPv4AndIPv6():
     This is a temporary workaround until maybe Twisted starts setting
     C{IPPROTO_IPV6 / IPV6_V6ONLY} on IPv6 sockets.
 
+    The answer cannot change while the process is running, so the probe (two
+    socket creations and binds) is only performed on the first call and the
+    result is cached for the rest of the process lifetime.
+
     @return: C{True} if listening on IPv4 conflicts with listening on IPv6.
     """
+    if _cache:
+        return _cache[0]
     s4 = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s6 = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
     try:
@@ -176,19 +196,20 @@ def conflictBetweenIPv4AndIPv6():
         try:
             s6.bind(("::", usedport))
         except socket.error:
-            return True
+            result = True
         else:
-            return False
+            result = False
     finally:
         s4.close()
         s6.close()
+    _cache.append(result)
+    return result
 
 
 def _computeEnvVars(parent):
     """
     Compute environment variables to be propagated to child processes.
     """
-    result = {}
     requiredVars = [
         "PATH",
         "PYTHONPATH",
@@ -205,11 +226,13 @@ def _computeEnvVars(parent):
         "VERSIONER_PYTHON_PREFER_32_BIT",
     ]
 
-    for varname in requiredVars:
-        result[varname] = parent.get(varname, "")
-    for varname in optionalVars:
-        if varname in parent:
-            result[varname] = parent[varname]
+    result = dict(
+        (varname, parent.get(varname, "")) for varname in requiredVars
+    )
+    result.update(
+        (varname, parent[varname])
+        for varname in optionalVars if varname in parent
+    )
 
     # Worker's stdXXX are piped, which ends up setting their encoding to None;
     # Have them inherit the master's encoding, even when being piped.
@@ -219,6 +242,210 @@ def _computeEnvVars(parent):
 
 PARENT_ENVIRONMENT = _computeEnvVars(environ)
 
+# memcached needs nothing from the parent environment beyond these; one
+# shared dict is passed by reference for every pool spawned.
+MEMCACHED_ENVIRONMENT = dict(
+    (varname, environ[varname])
+    for varname in ("PATH", "LANG", "LC_ALL")
+    if varname in environ
+)
+
+
+_SQL_STORE_CLASS = None
+
+
+def _sqlStoreClass():
+    """
+    Lazy import of the SQL store class, resolved once per process rather
+    than re-running the import machinery on every service (re)build.
+    """
+    global _SQL_STORE_CLASS
+    if _SQL_STORE_CLASS is None:
+        from txdav.common.datastore.sql import CommonDataStore
+        _SQL_STORE_CLASS = CommonDataStore
+    return _SQL_STORE_CLASS
+
+
+def _controlSocketPath():
+    """
+    The path the master and workers should use for the AF_UNIX control
+    socket, or None if AF_INET on the loopback must be used instead.
+
+    The control channel is purely intra-host, so AF_UNIX is preferred even
+    when ControlSocket is unset; in that case a path is derived from RunRoot
+    if it is a writable directory, and TCP is only a last resort.
+    """
+    if config.ControlSocket:
+        return config.ControlSocket
+    if config.RunRoot and isdir(config.RunRoot) and access(config.RunRoot, W_OK):
+        return joinpath(config.RunRoot, "caldavd-control.sock")
+    return None
+
+
+def _openListeningSocket(addr, port, backlog, reusePort=False):
+    """
+    Open a non-blocking listening TCP socket suitable for handing to an
+    accepting service (or inheriting to a child process).
+
+    The family is chosen from the address, as C{listenTCP} would; like the
+    C{listenTCP} path this deliberately leaves C{IPV6_V6ONLY} at the OS
+    default, which L{conflictBetweenIPv4AndIPv6} and the bind-address
+    consolidation logic are built around.
+    """
+    family = socket.AF_INET6 if ":" in addr else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setblocking(0)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reusePort:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((addr, port))
+    sock.listen(backlog)
+    if set_inheritable is not None:
+        set_inheritable(sock.fileno(), True)
+    return sock
+
+
+def _reusePortAvailable():
+    """
+    Whether this platform supports SO_REUSEPORT; the constant existing in
+    the socket module is not enough since the running kernel may still
+    refuse it, so probe with an actual setsockopt.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        return False
+    probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    except socket.error:
+        return False
+    finally:
+        probe.close()
+    return True
+
+
+def _preloadSlaveModules():
+    """
+    Import the heavy parts of the slave-side module graph in the master
+    before any slaves are spawned.  The slaves exec fresh interpreters,
+    so no memory is shared, but importing here compiles any stale .pyc
+    files once and leaves the source tree warm in the page cache rather
+    than having every slave grind through that work at the same moment.
+    Import failures are ignored; a module the slave genuinely needs will
+    produce its own error when the slave starts.
+    """
+    for moduleName in (
+        "twistedcaldav.ical",
+        "twistedcaldav.vcard",
+        "twistedcaldav.storebridge",
+        "txdav.caldav.datastore.sql",
+        "txdav.carddav.datastore.sql",
+        "txdav.common.datastore.sql",
+        "txdav.who.util",
+    ):
+        try:
+            __import__(moduleName)
+        except ImportError:
+            pass
+
+
+_MANHOLE_MAKER = None
+_MANHOLE_IMPORT_TRIED = False
+
+
+def _getManholeMaker():
+    """
+    Lazy import of the manhole service maker; the import is attempted at
+    most once per process since its availability cannot change.
+    """
+    global _MANHOLE_MAKER, _MANHOLE_IMPORT_TRIED
+    if not _MANHOLE_IMPORT_TRIED:
+        _MANHOLE_IMPORT_TRIED = True
+        try:
+            from twisted.conch.manhole_tap import (
+                makeService as manholeMakeService
+            )
+            _MANHOLE_MAKER = manholeMakeService
+        except ImportError:
+            pass
+    return _MANHOLE_MAKER
+
+
+# Size at which the buffered error log forces a flush rather than waiting for
+# the flush timer to fire.
+DEFAULT_BUFFER_CAPACITY = 8 * 1024
+
+
+class BufferedRotatingLogFile(LogFile):
+    """
+    A L{LogFile} which accumulates writes in an in-memory buffer and drains
+    that buffer from the reactor's thread pool, so that bursts of log messages
+    do not issue a synchronous write-plus-rotation-check per message on the
+    reactor thread.
+
+    Buffering is only in effect between L{startBuffering} and
+    L{stopBuffering}; outside of that window writes pass straight through to
+    L{LogFile}, which keeps early startup and shutdown messages synchronous.
+    """
+
+    flushInterval = 1.0
+
+    def __init__(self, *args, **kwargs):
+        LogFile.__init__(self, *args, **kwargs)
+        self._lock = threading.Lock()
+        self._writeLock = threading.Lock()
+        self._buffer = bytearray()
+        self._flusher = None
+        self._reactor = None
+
+    def startBuffering(self, reactor=None):
+        """
+        Begin buffering writes, flushing at least every L{flushInterval}
+        seconds.
+        """
+        if reactor is None:
+            from twisted.internet import reactor
+        self._reactor = reactor
+        self._flusher = LoopingCall(self._scheduleFlush)
+        self._flusher.clock = reactor
+        self._flusher.start(self.flushInterval, now=False)
+
+    def stopBuffering(self):
+        """
+        Stop buffering and synchronously drain anything still pending.
+        """
+        if self._flusher is not None:
+            if self._flusher.running:
+                self._flusher.stop()
+            self._flusher = None
+        self._writeBuffered()
+
+    def write(self, data):
+        if self._flusher is None:
+            LogFile.write(self, data)
+            return
+        with self._lock:
+            self._buffer.extend(data)
+            full = len(self._buffer) >= DEFAULT_BUFFER_CAPACITY
+        if full:
+            self._scheduleFlush()
+
+    def _scheduleFlush(self):
+        self._reactor.callInThread(self._writeBuffered)
+
+    def _writeBuffered(self):
+        # Flushes may run concurrently on several pool threads (and on the
+        # reactor thread at shutdown); _writeLock serializes the buffer pop
+        # and the seek/write/rotate in LogFile.write so drains cannot
+        # interleave, while producers blocking on _lock never wait on disk
+        # I/O.
+        with self._writeLock:
+            with self._lock:
+                if not self._buffer:
+                    return
+                data = str(self._buffer)
+                del self._buffer[:]
+            LogFile.write(self, data)
+
 
 class ErrorLoggingMultiService(MultiService, object):
     """ Registers a rotating file logger for error logging, if
@@ -247,19 +474,21 @@ class ErrorLoggingMultiService(MultiService, object):
         self.logRotateLength = logRotateLength
         self.logMaxFiles = logMaxFiles
         self.logRotateOnStart = logRotateOnStart
+        self.errorLogFile = None
         self.name = "elms"
 
     def setServiceParent(self, app):
         MultiService.setServiceParent(self, app)
 
         if self.logEnabled:
-            errorLogFile = LogFile.fromFullPath(
+            errorLogFile = BufferedRotatingLogFile.fromFullPath(
                 self.logPath,
                 rotateLength=self.logRotateLength,
                 maxRotatedFiles=self.logMaxFiles
             )
             if self.logRotateOnStart:
                 errorLogFile.rotate()
+            self.errorLogFile = errorLogFile
             encoding = "utf-8"
         else:
             errorLogFile = sys.stdout
@@ -275,6 +504,17 @@ class ErrorLoggingMultiService(MultiService, object):
         # gets our observer picked up within AppLogger.start( )
         app.setComponent(ILogObserver, errorLogObserver)
 
+    def privilegedStartService(self):
+        MultiService.privilegedStartService(self)
+        if self.errorLogFile is not None:
+            self.errorLogFile.startBuffering()
+
+    def stopService(self):
+        d = MultiService.stopService(self)
+        if self.errorLogFile is not None:
+            self.errorLogFile.stopBuffering()
+        return d
+
 
 class CalDAVService (ErrorLoggingMultiService):
 
@@ -296,7 +536,7 @@ class CalDAVService (ErrorLoggingMultiService):
         self.name = "cds"
 
     def privilegedStartService(self):
-        MultiService.privilegedStartService(self)
+        ErrorLoggingMultiService.privilegedStartService(self)
         self.logObserver.start()
 
     @inlineCallbacks
@@ -315,6 +555,33 @@ class CalDAVService (ErrorLoggingMultiService):
         self.logObserver.stop()
 
 
+def _coerceBool(value):
+    return value == "True"
+
+
+def _coerceSeq(value):
+    return value.split(",")
+
+
+def _coerceDict(value):
+    raise UsageError(
+        "Dict options not supported on the command line"
+    )
+
+
+# Maps the type of an existing config value to the callable that coerces the
+# command-line string for it.  Exact type lookup keeps bool distinct from int.
+_OPTION_COERCERS = {
+    bool: _coerceBool,
+    int: int,
+    long: long,
+    float: float,
+    list: _coerceSeq,
+    tuple: _coerceSeq,
+    dict: _coerceDict,
+}
+
+
 class CalDAVOptions (Options):
     log = Logger()
 
@@ -335,22 +602,16 @@ class CalDAVOptions (Options):
         Coerce the given C{val} to type of C{configDict[key]}
         """
         if key in configDict:
-            if isinstance(configDict[key], bool):
-                value = value == "True"
+            current = configDict[key]
+            coercer = _OPTION_COERCERS.get(type(current))
+            if coercer is None and isinstance(current, dict):
+                # dict subclasses such as ConfigDict
+                coercer = _coerceDict
+            if coercer is not None:
+                return coercer(value)
 
-            elif isinstance(configDict[key], (int, float, long)):
-                value = type(configDict[key])(value)
-
-            elif isinstance(configDict[key], (list, tuple)):
-                value = value.split(",")
-
-            elif isinstance(configDict[key], dict):
-                raise UsageError(
-                    "Dict options not supported on the command line"
-                )
-
-            elif value == "None":
-                value = None
+            if value == "None":
+                return None
 
         return value
 
@@ -359,13 +620,10 @@ class CalDAVOptions (Options):
         """
         Set the value at path in configDict
         """
-        key = path[0]
-
-        if len(path) == 1:
-            overrideDict[key] = cls.coerceOption(configDict, key, value)
-            return
+        for key in path[:-1]:
+            if key not in configDict:
+                return
 
-        if key in configDict:
             if not isinstance(configDict[key], dict):
                 raise UsageError(
                     "Found intermediate path element that is not a dictionary"
@@ -374,10 +632,11 @@ class CalDAVOptions (Options):
             if key not in overrideDict:
                 overrideDict[key] = {}
 
-            cls.setOverride(
-                configDict[key], path[1:],
-                value, overrideDict[key]
-            )
+            configDict = configDict[key]
+            overrideDict = overrideDict[key]
+
+        key = path[-1]
+        overrideDict[key] = cls.coerceOption(configDict, key, value)
 
     def opt_option(self, option):
         """
@@ -390,7 +649,7 @@ class CalDAVOptions (Options):
             path, value = option.split("=")
             self.setOverride(
                 DEFAULT_CONFIG,
-                path.split("/"),
+                tuple(intern(part) for part in path.split("/")),
                 value,
                 self.overrides
             )
@@ -429,16 +688,26 @@ class CalDAVOptions (Options):
                 .format(self["config"])
             )
 
-        print("Reading configuration from file:", self["config"])
+        lines = ["Reading configuration from file: {}".format(self["config"])]
 
         config.load(self["config"])
 
-        for path in config.getProvider().importedFiles:
-            print("Imported configuration from file:", path)
-        for path in config.getProvider().includedFiles:
-            print("Adding configuration from file:", path)
-        for path in config.getProvider().missingFiles:
-            print("Missing configuration file:", path)
+        provider = config.getProvider()
+        lines.extend(
+            "Imported configuration from file: {}".format(path)
+            for path in provider.importedFiles
+        )
+        lines.extend(
+            "Adding configuration from file: {}".format(path)
+            for path in provider.includedFiles
+        )
+        lines.extend(
+            "Missing configuration file: {}".format(path)
+            for path in provider.missingFiles
+        )
+
+        # One write instead of one syscall per print
+        sys.stdout.write("\n".join(lines) + "\n")
 
         config.updateDefaults(self.overrides)
 
@@ -452,18 +721,20 @@ class CalDAVOptions (Options):
         if self.parent["uid"] or self.parent["gid"]:
             uid, gid = getid(self.parent["uid"], self.parent["gid"])
 
+        myuid, mygid = getuid(), getgid()
+
         def gottaBeRoot():
-            if getuid() != 0:
-                username = getpwuid(getuid()).pw_name
+            if myuid != 0:
+                username = getpwuid(myuid).pw_name
                 raise UsageError(
                     "Only root can drop privileges.  You are: {}"
                     .format(username)
                 )
 
-        if uid and uid != getuid():
+        if uid and uid != myuid:
             gottaBeRoot()
 
-        if gid and gid != getgid():
+        if gid and gid != mygid:
             gottaBeRoot()
 
         self.parent["pidfile"] = config.PIDFile
@@ -526,6 +797,10 @@ class SlaveSpawnerService(Service):
 
     def startService(self):
 
+        # All slaves share the single module-level environment dict; bind it
+        # once here rather than re-fetching the global per spawn.
+        env = PARENT_ENVIRONMENT
+
         if config.DirectoryProxy.Enabled:
             # Add the directory proxy sidecar first so it at least get spawned
             # prior to the caldavd worker processes:
@@ -552,26 +827,38 @@ class SlaveSpawnerService(Service):
                 "-o", "ErrorLogEnabled=False",
             ))
             self.monitor.addProcess(
-                "directoryproxy", dpsArgv, env=PARENT_ENVIRONMENT
+                "directoryproxy", dpsArgv, env=env
             )
         else:
             log.info("Directory proxy service is not enabled")
 
-        for slaveNumber in xrange(0, config.MultiProcess.ProcessCount):
-            if config.UseMetaFD:
-                extraArgs = dict(
-                    metaSocket=self.dispatcher.addSocket(slaveNumber)
+        processCount = config.MultiProcess.ProcessCount
+
+        if config.UseMetaFD:
+            # Allocate all dispatcher sockets in one pass up front, rather
+            # than interleaving socket allocation with process construction
+            metaSockets = [
+                self.dispatcher.addSocket(slaveNumber)
+                for slaveNumber in xrange(processCount)
+            ]
+            for slaveNumber in xrange(processCount):
+                process = TwistdSlaveProcess(
+                    sys.argv[0], self.maker.tapname, self.configPath,
+                    slaveNumber, config.BindAddresses,
+                    metaSocket=metaSockets[slaveNumber],
+                    ampSQLDispenser=self.dispenser,
                 )
-            else:
-                extraArgs = dict(inheritFDs=self.inheritFDs,
-                                 inheritSSLFDs=self.inheritSSLFDs)
-            if self.dispenser is not None:
-                extraArgs.update(ampSQLDispenser=self.dispenser)
-            process = TwistdSlaveProcess(
-                sys.argv[0], self.maker.tapname, self.configPath, slaveNumber,
-                config.BindAddresses, **extraArgs
-            )
-            self.monitor.addProcessObject(process, PARENT_ENVIRONMENT)
+                self.monitor.addProcessObject(process, env)
+        else:
+            for slaveNumber in xrange(processCount):
+                process = TwistdSlaveProcess(
+                    sys.argv[0], self.maker.tapname, self.configPath,
+                    slaveNumber, config.BindAddresses,
+                    inheritFDs=self.inheritFDs,
+                    inheritSSLFDs=self.inheritSSLFDs,
+                    ampSQLDispenser=self.dispenser,
+                )
+                self.monitor.addProcessObject(process, env)
 
         # Hook up the stats service directory to the DPS server after a short delay
         if self.stats is not None:
@@ -604,38 +891,31 @@ class WorkSchedulingService(Service):
 
     @inlineCallbacks
     def initializeWork(self):
+        from calendarserver.push.applepush import APNPurgingWork
+        from txdav.caldav.datastore.scheduling.imip.inbound import (
+            scheduleNextMailPoll
+        )
+
         # Note: the "seconds in the future" args are being set to the LogID
         # numbers to spread them out.  This is only needed until
         # ultimatelyPerform( ) handles groups correctly.  Once that is fixed
         # these can be set to zero seconds in the future.
 
+        delay = int(config.LogID) if config.LogID else 5
+
+        # The initial schedules are independent of one another, so let their
+        # DB round-trips run concurrently rather than one after another
+        work = []
         if self.doImip:
-            yield scheduleNextMailPoll(
-                self.store,
-                int(config.LogID) if config.LogID else 5
-            )
+            work.append(scheduleNextMailPoll(self.store, delay))
         if self.doGroupCaching:
-            yield GroupCacherPollingWork.initialSchedule(
-                self.store,
-                int(config.LogID) if config.LogID else 5
-            )
+            work.append(GroupCacherPollingWork.initialSchedule(self.store, delay))
         if self.doPrincipalPurging:
-            yield PrincipalPurgePollingWork.initialSchedule(
-                self.store,
-                int(config.LogID) if config.LogID else 5
-            )
-        yield FindMinValidRevisionWork.initialSchedule(
-            self.store,
-            int(config.LogID) if config.LogID else 5
-        )
-        yield InboxCleanupWork.initialSchedule(
-            self.store,
-            int(config.LogID) if config.LogID else 5
-        )
-        yield APNPurgingWork.initialSchedule(
-            self.store,
-            int(config.LogID) if config.LogID else 5
-        )
+            work.append(PrincipalPurgePollingWork.initialSchedule(self.store, delay))
+        work.append(FindMinValidRevisionWork.initialSchedule(self.store, delay))
+        work.append(InboxCleanupWork.initialSchedule(self.store, delay))
+        work.append(APNPurgingWork.initialSchedule(self.store, delay))
+        yield gatherResults(work)
 
 
 class PreProcessingService(Service):
@@ -736,6 +1016,13 @@ class PreProcessingService(Service):
         self.stepper.addStep(step)
         return self
 
+    def shortCircuit(self, resumeStep=None):
+        """
+        Skip the remaining steps, resuming at resumeStep if given, otherwise
+        at the final step (ourself).
+        """
+        self.stepper.shortCircuit(resumeStep)
+
     def startService(self):
         """
         Add ourself as the final step, and then tell the coordinator to start
@@ -745,6 +1032,49 @@ class PreProcessingService(Service):
         self.stepper.start()
 
 
+def _addHSTSHeader(request, response):
+    """
+    Response filter which adds the Strict-Transport-Security header, using
+    the value formatted once at service setup, to responses sent over a
+    secured channel.
+    """
+    ignored, secure = request.chanRequest.getHostInfo()
+    if secure:
+        response.headers.addRawHeader(
+            "Strict-Transport-Security", _HSTSRequestMixin.hstsHeaderValue
+        )
+    return response
+
+_addHSTSHeader.handleErrors = True
+
+
+class _HSTSRequestMixin(object):
+    """
+    Mixin for request classes whose responses carry the
+    Strict-Transport-Security header; the header value is computed once in
+    L{CalDAVServiceMaker.requestProcessingService} rather than per response.
+    """
+    hstsHeaderValue = None
+
+
+class _HSTSRequest(_HSTSRequestMixin, Request):
+    responseFilters = [_addHSTSHeader] + Request.responseFilters
+
+
+class _SSLRedirectHSTSRequest(_HSTSRequestMixin, SSLRedirectRequest):
+    responseFilters = [_addHSTSHeader] + SSLRedirectRequest.responseFilters
+
+
+# The request class to use keyed by (redirect HTTP to HTTPS, HSTS enabled);
+# None means requests can be constructed by the Site itself.
+_REQUEST_CLASSES = {
+    (False, False): None,
+    (False, True): _HSTSRequest,
+    (True, False): SSLRedirectRequest,
+    (True, True): _SSLRedirectHSTSRequest,
+}
+
+
 class StoreNotAvailable(Exception):
     """
     Raised when we want to give up because the store is not available
@@ -778,19 +1108,16 @@ class CalDAVServiceMaker (object):
             pass
 
         else:
-            execName = basename(sys.argv[0])
-
             if config.LogID:
                 logID = " #{}".format(config.LogID)
             else:
                 logID = ""
 
-            if config.ProcessType != "Utility":
-                execName = ""
+            execName = _EXEC_NAME if config.ProcessType == "Utility" else ""
 
             setproctitle(
-                "CalendarServer {} [{}{}] {}"
-                .format(version, config.ProcessType, logID, execName)
+                "CalendarServer %s [%s%s] %s"
+                % (version, config.ProcessType, logID, execName)
             )
 
         serviceMethod = getattr(
@@ -872,12 +1199,149 @@ class CalDAVServiceMaker (object):
             sendCAsToClient=config.Authentication.ClientCertificate.SendCAsToClient,
         )
 
+    _cachedContextFactory = None
+
+    # Popen handles for memcached children spawned outside a ProcessMonitor,
+    # and the timer that reaps them when they exit
+    _memcachedProcesses = None
+    _memcachedReaper = None
+
+    def cachedContextFactory(self):
+        """
+        Like createContextFactory, but reuses the previously built context
+        when the certificate and key paths are unchanged; building a context
+        parses the PEM certificates, keys and DH parameters, which only
+        needs doing once per configuration no matter how many listeners
+        share it.
+        """
+        key = (config.SSLCertificate, config.SSLPrivateKey)
+        if (
+            self._cachedContextFactory is None or
+            self._cachedContextFactory[0] != key
+        ):
+            self._cachedContextFactory = (key, self.createContextFactory())
+        return self._cachedContextFactory[1]
+
+    def _setupPushDistributor(self, parent, store, controlSocketClient=None):
+        """
+        Optionally set up push notifications, returning the distributor the
+        transactions should use, or None when notifications are disabled.
+
+        @param controlSocketClient: in the worker case, the control socket
+            used to forward pushes to the master; C{None} in stand-alone
+            mode, where the AMP push master runs in this process.
+        """
+        if not config.Notifications.Enabled:
+            return None
+        observers = []
+        if config.Notifications.Services.APNS.Enabled:
+            from calendarserver.push.applepush import (
+                ApplePushNotifierService
+            )
+            pushSubService = ApplePushNotifierService.makeService(
+                config.Notifications.Services.APNS, store)
+            observers.append(pushSubService)
+            pushSubService.setName("APNS")
+            pushSubService.setServiceParent(parent)
+        if config.Notifications.Services.AMP.Enabled:
+            if controlSocketClient is not None:
+                from calendarserver.push.amppush import AMPPushForwarder
+                pushSubService = AMPPushForwarder(controlSocketClient)
+            else:
+                from calendarserver.push.amppush import AMPPushMaster
+                pushSubService = AMPPushMaster(
+                    None, parent,
+                    config.Notifications.Services.AMP.Port,
+                    config.Notifications.Services.AMP.EnableStaggering,
+                    config.Notifications.Services.AMP.StaggerSeconds,
+                )
+            observers.append(pushSubService)
+        if not observers:
+            return None
+        coalesceMS = config.Notifications.CoalesceMS
+        if coalesceMS:
+            return BatchingPushDistributor(
+                observers, store, coalesceMS / 1000.0
+            )
+        return PushDistributor(observers)
+
+    def _setupMailRetriever(self, parent, store, directory):
+        """
+        Optionally set up mail retrieval, returning the retriever service or
+        None when iMIP is disabled.
+        """
+        if not config.Scheduling.iMIP.Enabled:
+            return None
+        from txdav.caldav.datastore.scheduling.imip.inbound import (
+            MailRetriever
+        )
+        mailRetriever = MailRetriever(
+            store, directory, config.Scheduling.iMIP.Receiving
+        )
+        mailRetriever.setName("MailRetriever")
+        mailRetriever.setServiceParent(parent)
+        return mailRetriever
+
+    def _setupGroupCacher(self, directory):
+        """
+        Optionally set up the group cacher, returning it or None when group
+        caching is disabled.
+        """
+        if not config.GroupCaching.Enabled:
+            return None
+        from twistedcaldav.cache import (
+            MemcacheGenerationalChangeNotifier,
+            PRINCIPAL_TOKEN_GENERATION_KEY
+        )
+        cacheNotifier = MemcacheGenerationalChangeNotifier(PRINCIPAL_TOKEN_GENERATION_KEY, cacheHandle="PrincipalToken") if config.EnableResponseCache else None
+        return GroupCacher(
+            directory,
+            updateSeconds=config.GroupCaching.UpdateSeconds,
+            initialSchedulingDelaySeconds=config.GroupCaching.InitialSchedulingDelaySeconds,
+            batchSize=config.GroupCaching.BatchSize,
+            batchSchedulingIntervalSeconds=config.GroupCaching.BatchSchedulingIntervalSeconds,
+            useDirectoryBasedDelegates=config.GroupCaching.UseDirectoryBasedDelegates,
+            cacheNotifier=cacheNotifier,
+        )
+
+    def _installTransactionDecorator(
+        self, store, pushDistributor, rootResource, mailRetriever, groupCacher
+    ):
+        """
+        Arrange for every new transaction to carry the given services. The
+        SQL store takes them as one bundle, assigned to each transaction in
+        a single attribute store; other stores fall back to a per-attribute
+        callback.
+        """
+        if isinstance(store, _sqlStoreClass()):
+            from txdav.common.datastore.sql import TransactionServices
+            store.setTransactionServices(TransactionServices(
+                pushDistributor=pushDistributor,
+                rootResource=rootResource,
+                mailRetriever=mailRetriever,
+                groupCacher=groupCacher,
+            ))
+        else:
+            def decorateTransaction(txn):
+                txn._pushDistributor = pushDistributor
+                txn._rootResource = rootResource
+                txn._mailRetriever = mailRetriever
+                txn._groupCacher = groupCacher
+
+            store.callWithNewTransactions(decorateTransaction)
+
     def makeService_Slave(self, options):
         """
         Create a "slave" service, a subprocess of a service created with
         L{makeService_Combined}, which does the work of actually handling
         CalDAV and CardDAV requests.
         """
+        if config.MultiProcess.MergeStderr:
+            # Point our stderr at the stdout log pipe so everything we
+            # emit flows to the master over one pipe; the master then
+            # sees one stream of wakeups per slave instead of two.
+            dup2(1, 2)
+
         pool, txnFactory = getDBPool(config)
         if config.DirectoryProxy.Enabled:
             store = storeFromConfigWithDPSClient(config, txnFactory)
@@ -897,8 +1361,9 @@ class CalDAVServiceMaker (object):
             pool.setName("db")
             pool.setServiceParent(result)
 
-        if config.ControlSocket:
-            id = config.ControlSocket
+        controlSocketPath = _controlSocketPath()
+        if controlSocketPath:
+            id = controlSocketPath
             self.log.info("Control via AF_UNIX: {id}", id=id)
             endpointFactory = lambda reactor: UNIXClientEndpoint(
                 reactor, id
@@ -922,9 +1387,7 @@ class CalDAVServiceMaker (object):
 
         controlSocketClient.addFactory(_LOG_ROUTE, f)
 
-        from txdav.common.datastore.sql import CommonDataStore as SQLStore
-
-        if isinstance(store, SQLStore):
+        if isinstance(store, _sqlStoreClass()):
             def queueMasterAvailable(connectionFromMaster):
                 store.queuer = connectionFromMaster
             queueFactory = QueueWorkerFactory(
@@ -938,57 +1401,19 @@ class CalDAVServiceMaker (object):
         controlClient.setName("control")
         controlClient.setServiceParent(result)
 
-        # Optionally set up push notifications
-        pushDistributor = None
-        if config.Notifications.Enabled:
-            observers = []
-            if config.Notifications.Services.APNS.Enabled:
-                pushSubService = ApplePushNotifierService.makeService(
-                    config.Notifications.Services.APNS, store)
-                observers.append(pushSubService)
-                pushSubService.setName("APNS")
-                pushSubService.setServiceParent(result)
-            if config.Notifications.Services.AMP.Enabled:
-                pushSubService = AMPPushForwarder(controlSocketClient)
-                observers.append(pushSubService)
-            if observers:
-                pushDistributor = PushDistributor(observers)
-
-        # Optionally set up mail retrieval
-        if config.Scheduling.iMIP.Enabled:
-            mailRetriever = MailRetriever(
-                store, directory, config.Scheduling.iMIP.Receiving
-            )
-            mailRetriever.setName("MailRetriever")
-            mailRetriever.setServiceParent(result)
-        else:
-            mailRetriever = None
-
-        # Optionally set up group cacher
-        if config.GroupCaching.Enabled:
-            cacheNotifier = MemcacheURLPatternChangeNotifier("/principals/__uids__/{token}/", cacheHandle="PrincipalToken") if config.EnableResponseCache else None
-            groupCacher = GroupCacher(
-                directory,
-                updateSeconds=config.GroupCaching.UpdateSeconds,
-                initialSchedulingDelaySeconds=config.GroupCaching.InitialSchedulingDelaySeconds,
-                batchSize=config.GroupCaching.BatchSize,
-                batchSchedulingIntervalSeconds=config.GroupCaching.BatchSchedulingIntervalSeconds,
-                useDirectoryBasedDelegates=config.GroupCaching.UseDirectoryBasedDelegates,
-                cacheNotifier=cacheNotifier,
-            )
-        else:
-            groupCacher = None
+        pushDistributor = self._setupPushDistributor(
+            result, store, controlSocketClient
+        )
+        mailRetriever = self._setupMailRetriever(result, store, directory)
+        groupCacher = self._setupGroupCacher(directory)
 
         # Allow worker to post alerts to master
         AlertPoster.setupForWorker(controlSocketClient)
 
-        def decorateTransaction(txn):
-            txn._pushDistributor = pushDistributor
-            txn._rootResource = result.rootResource
-            txn._mailRetriever = mailRetriever
-            txn._groupCacher = groupCacher
-
-        store.callWithNewTransactions(decorateTransaction)
+        self._installTransactionDecorator(
+            store, pushDistributor, result.rootResource, mailRetriever,
+            groupCacher
+        )
         return result
 
     def requestProcessingService(self, options, store, logObserver):
@@ -1006,10 +1431,6 @@ class CalDAVServiceMaker (object):
         oldLogLevel = log.levels().logLevelForNamespace(None)
         log.levels().setLogLevelForNamespace(None, LogLevel.info)
 
-        # Note: 'additional' was used for IMIP reply resource, and perhaps
-        # we can remove this
-        additional = []
-
         #
         # Configure the service
         #
@@ -1020,63 +1441,66 @@ class CalDAVServiceMaker (object):
         )
         service = CalDAVService(logObserver)
 
-        rootResource = getRootResource(config, store, additional)
+        # Each config attribute read dispatches through ConfigDict's
+        # __getattr__; hoist the values consulted repeatedly below into
+        # locals.
+        enableSSL = config.EnableSSL
+        listenBacklog = config.ListenBacklog
+        maxRequests = config.MaxRequests
+        maxAccepts = config.MaxAccepts
+        idleTimeOut = config.IdleConnectionTimeOut
+        hstsSeconds = config.StrictTransportSecuritySeconds
+
+        # The empty list was 'additional', once used for the IMIP reply
+        # resource; nothing needs it any more.
+        rootResource = getRootResource(config, store, [])
         service.rootResource = rootResource
 
         underlyingSite = Site(rootResource)
 
         # Need to cache SSL port info here so we can access it in a Request to
         # deal with the possibility of being behind an SSL decoder
-        underlyingSite.EnableSSL = config.EnableSSL
+        underlyingSite.EnableSSL = enableSSL
         underlyingSite.BehindTLSProxy = config.BehindTLSProxy
         underlyingSite.SSLPort = config.SSLPort
         underlyingSite.BindSSLPorts = config.BindSSLPorts
 
-        requestFactory = underlyingSite
-
-        if (config.EnableSSL or config.BehindTLSProxy) and config.RedirectHTTPToHTTPS:
+        redirectToSSL = bool(
+            (enableSSL or config.BehindTLSProxy) and
+            config.RedirectHTTPToHTTPS
+        )
+        if redirectToSSL:
             self.log.info(
                 "Redirecting to HTTPS port {port}", port=config.SSLPort
             )
 
-            def requestFactory(*args, **kw):
-                return SSLRedirectRequest(site=underlyingSite, *args, **kw)
-
         # Setup HTTP connection behaviors
         HTTPChannel.allowPersistentConnections = config.EnableKeepAlive
         HTTPChannel.betweenRequestsTimeOut = config.PipelineIdleTimeOut
         HTTPChannel.inputTimeOut = config.IncomingDataTimeOut
-        HTTPChannel.idleTimeOut = config.IdleConnectionTimeOut
+        HTTPChannel.idleTimeOut = idleTimeOut
         HTTPChannel.closeTimeOut = config.CloseConnectionTimeOut
 
         # Add the Strict-Transport-Security header to all secured requests
-        # if enabled.
-        if config.StrictTransportSecuritySeconds:
-            previousRequestFactory = requestFactory
+        # if enabled.  The header value and the request class to use are
+        # computed once here rather than per request.
+        if hstsSeconds:
+            _HSTSRequestMixin.hstsHeaderValue = "max-age={max_age:d}".format(
+                max_age=hstsSeconds
+            )
 
+        requestClass = _REQUEST_CLASSES[(redirectToSSL, bool(hstsSeconds))]
+        if requestClass is None:
+            requestFactory = underlyingSite
+        else:
             def requestFactory(*args, **kw):
-                request = previousRequestFactory(*args, **kw)
-
-                def responseFilter(ignored, response):
-                    ignored, secure = request.chanRequest.getHostInfo()
-                    if secure:
-                        response.headers.addRawHeader(
-                            "Strict-Transport-Security",
-                            "max-age={max_age:d}".format(
-                                max_age=config.StrictTransportSecuritySeconds
-                            )
-                        )
-                    return response
-
-                responseFilter.handleErrors = True
-                request.addResponseFilter(responseFilter)
-                return request
+                return requestClass(site=underlyingSite, *args, **kw)
 
         httpFactory = LimitingHTTPFactory(
             requestFactory,
-            maxRequests=config.MaxRequests,
-            maxAccepts=config.MaxAccepts,
-            betweenRequestsTimeOut=config.IdleConnectionTimeOut,
+            maxRequests=maxRequests,
+            maxAccepts=maxAccepts,
+            betweenRequestsTimeOut=idleTimeOut,
             vary=True,
         )
 
@@ -1107,26 +1531,29 @@ class CalDAVServiceMaker (object):
         if config.InheritFDs or config.InheritSSLFDs:
             # Inherit sockets to call accept() on them individually.
 
-            if config.EnableSSL:
-                for fdAsStr in config.InheritSSLFDs:
-                    try:
-                        contextFactory = self.createContextFactory()
-                    except SSLError, e:
-                        log.error(
-                            "Unable to set up SSL context factory: {error}",
-                            error=e
-                        )
-                    else:
+            if enableSSL:
+                # One SSL context serves every inherited FD; parsing the
+                # certificates once is all that is needed.
+                contextFactory = None
+                try:
+                    contextFactory = self.cachedContextFactory()
+                except SSLError, e:
+                    log.error(
+                        "Unable to set up SSL context factory: {error}",
+                        error=e
+                    )
+                if contextFactory is not None:
+                    for fdAsStr in config.InheritSSLFDs:
                         MaxAcceptSSLServer(
                             int(fdAsStr), httpFactory,
                             contextFactory,
-                            backlog=config.ListenBacklog,
+                            backlog=listenBacklog,
                             inherit=True
                         ).setServiceParent(connectionService)
             for fdAsStr in config.InheritFDs:
                 MaxAcceptTCPServer(
                     int(fdAsStr), httpFactory,
-                    backlog=config.ListenBacklog,
+                    backlog=listenBacklog,
                     inherit=True
                 ).setServiceParent(connectionService)
 
@@ -1139,7 +1566,7 @@ class CalDAVServiceMaker (object):
                 contextFactory = None
             else:
                 try:
-                    contextFactory = self.createContextFactory()
+                    contextFactory = self.cachedContextFactory()
                 except SSLError, e:
                     self.log.error(
                         "Unable to set up SSL context factory: {error}",
@@ -1158,41 +1585,76 @@ class CalDAVServiceMaker (object):
             reportingService.setServiceParent(connectionService)
 
         else:  # Not inheriting, therefore we open our own:
+            contextFactory = None
+            if enableSSL:
+                # One context is shared by every SSL listener
+                try:
+                    contextFactory = self.cachedContextFactory()
+                except SSLError, e:
+                    self.log.error(
+                        "Unable to set up SSL context factory: {error}"
+                        "Disabling SSL",
+                        error=e
+                    )
+            self._validatePortConfig()
+
+            # With UseReusePort each worker binds its own SO_REUSEPORT
+            # socket per port and the kernel spreads accepts across the
+            # workers' sockets; the master opens nothing in that mode.
+            reusePort = config.UseReusePort and _reusePortAvailable()
+            if reusePort:
+                # keep a reference to these so they don't close
+                service._reusePortSockets = []
+
             for bindAddress in self._allBindAddresses():
-                self._validatePortConfig()
-                if config.EnableSSL:
+                if contextFactory is not None:
                     for port in config.BindSSLPorts:
                         self.log.info(
                             "Adding SSL server at {address}:{port}",
                             address=bindAddress, port=port
                         )
-
-                        try:
-                            contextFactory = self.createContextFactory()
-                        except SSLError, e:
-                            self.log.error(
-                                "Unable to set up SSL context factory: {error}"
-                                "Disabling SSL port: {port}",
-                                error=e, port=port
+                        if reusePort:
+                            sock = _openListeningSocket(
+                                bindAddress, int(port), listenBacklog,
+                                reusePort=True
+                            )
+                            service._reusePortSockets.append(sock)
+                            httpsService = MaxAcceptSSLServer(
+                                sock.fileno(), httpFactory,
+                                contextFactory,
+                                backlog=listenBacklog,
+                                inherit=True
                             )
                         else:
                             httpsService = MaxAcceptSSLServer(
                                 int(port), httpFactory,
                                 contextFactory, interface=bindAddress,
-                                backlog=config.ListenBacklog,
+                                backlog=listenBacklog,
                                 inherit=False
                             )
-                            httpsService.setName(
-                                "https-{}:{}".format(bindAddress, int(port)))
-                            httpsService.setServiceParent(connectionService)
+                        httpsService.setName(
+                            "https-{}:{}".format(bindAddress, int(port)))
+                        httpsService.setServiceParent(connectionService)
 
                 for port in config.BindHTTPPorts:
-                    MaxAcceptTCPServer(
-                        int(port), httpFactory,
-                        interface=bindAddress,
-                        backlog=config.ListenBacklog,
-                        inherit=False
-                    ).setServiceParent(connectionService)
+                    if reusePort:
+                        sock = _openListeningSocket(
+                            bindAddress, int(port), listenBacklog,
+                            reusePort=True
+                        )
+                        service._reusePortSockets.append(sock)
+                        MaxAcceptTCPServer(
+                            sock.fileno(), httpFactory,
+                            backlog=listenBacklog,
+                            inherit=True
+                        ).setServiceParent(connectionService)
+                    else:
+                        MaxAcceptTCPServer(
+                            int(port), httpFactory,
+                            interface=bindAddress,
+                            backlog=listenBacklog,
+                            inherit=False
+                        ).setServiceParent(connectionService)
 
         # Change log level back to what it was before
         log.levels().setLogLevelForNamespace(None, oldLogLevel)
@@ -1223,6 +1685,16 @@ class CalDAVServiceMaker (object):
         elif config.SSLPort != 0:
             config.BindSSLPorts = [config.SSLPort]
 
+        # An undersized accept backlog drops connections when clients
+        # reconnect in waves after a network blip; treat anything below
+        # 128 as a misconfiguration and raise it.
+        if config.ListenBacklog < 128:
+            self.log.warn(
+                "ListenBacklog of {backlog} is too small; using 1024",
+                backlog=config.ListenBacklog
+            )
+            config.ListenBacklog = 1024
+
     def _allBindAddresses(self):
         """
         An empty array for the config value of BindAddresses should be
@@ -1241,13 +1713,28 @@ class CalDAVServiceMaker (object):
                     config.BindAddresses = ["", "::"]
             else:
                 config.BindAddresses = [""]
-        return config.BindAddresses
+
+        # If a wildcard address is listed, explicit addresses of the same
+        # family are redundant - the wildcard already covers them - and
+        # each one would cost a listening socket per port, all inherited
+        # by every slave.
+        addresses = config.BindAddresses
+        hasV4Wildcard = "" in addresses
+        hasV6Wildcard = "::" in addresses
+        if hasV4Wildcard or hasV6Wildcard:
+            addresses = [
+                addr for addr in addresses
+                if addr in ("", "::") or
+                not (hasV6Wildcard if ":" in addr else hasV4Wildcard)
+            ]
+        return addresses
 
     def _spawnMemcached(self, monitor=None):
         """
         Optionally start memcached through the specified ProcessMonitor,
         or if monitor is None, use Popen.
         """
+        spawnArgvs = []
         for name, pool in config.Memcached.Pools.items():
             if pool.ServerEnabled:
                 memcachedArgv = [
@@ -1275,51 +1762,39 @@ class CalDAVServiceMaker (object):
                 if monitor is not None:
                     monitor.addProcess(
                         "memcached-{}".format(name), memcachedArgv,
-                        env=PARENT_ENVIRONMENT
+                        env=MEMCACHED_ENVIRONMENT
                     )
                 else:
-                    Popen(memcachedArgv)
+                    spawnArgvs.append(memcachedArgv)
+
+        if spawnArgvs:
+            # Issue all the spawns back to back and only then collect the
+            # handles, so multi-pool configs do not pay any per-pool
+            # bookkeeping between forks.
+            self._memcachedProcesses = [
+                Popen(argv, env=MEMCACHED_ENVIRONMENT, close_fds=True)
+                for argv in spawnArgvs
+            ]
+            # Holding the Popen handles disables subprocess's lazy
+            # reaping, so poll them ourselves; without this a memcached
+            # child that dies would stay a zombie for the life of this
+            # process.
+            from twisted.internet import reactor
+            self._memcachedReaper = LoopingCall(self._reapMemcached)
+            self._memcachedReaper.clock = reactor
+            self._memcachedReaper.start(self._memcachedReapInterval, now=False)
+
+    # How often to poll directly-spawned memcached children for exit
+    _memcachedReapInterval = 10.0
+
+    def _reapMemcached(self):
+        for proc in self._memcachedProcesses:
+            proc.poll()
 
     def _makeManhole(self, namespace=None, parent=None):
-        try:
-            import inspect
-            import objgraph
-        except ImportError:
-            pass
-        try:
-            if 'inspect' in locals():
-                namespace['ins'] = inspect
-            if 'objgraph' in locals():
-                namespace['og'] = objgraph
-            from pprint import pprint
-            namespace.update({
-                'pp': pprint,
-                'cfg': config,
-            })
-            from twisted.conch.manhole_tap import (
-                makeService as manholeMakeService
-            )
-            portOffset = 0 if config.LogID == '' else int(config.LogID) + 1
-            portString = "tcp:{:d}:interface=127.0.0.1".format(
-                config.Manhole.StartingPortNumber + portOffset
-            )
-            manholeService = manholeMakeService({
-                "passwd": config.Manhole.PasswordFilePath,
-                "telnetPort":
-                    portString if config.Manhole.UseSSH is False else None,
-                "sshPort":
-                    portString if config.Manhole.UseSSH is True else None,
-                "sshKeyDir": config.DataRoot,
-                "sshKeyName": config.Manhole.sshKeyName,
-                "sshKeySize": config.Manhole.sshKeySize,
-                "namespace": namespace,
-            })
-            manholeService.setName("manhole")
-            if parent is not None:
-                manholeService.setServiceParent(parent)
+        manholeMakeService = _getManholeMaker()
+        if manholeMakeService is None:
             # Using print(because logging isn't ready at this point)
-            print("Manhole access enabled:", portString)
-        except ImportError:
             print(
                 "Manhole access could not enabled because "
                 "manhole_tap could not be imported."
@@ -1331,6 +1806,41 @@ class CalDAVServiceMaker (object):
                         "Set Manhole.UseSSH to false or rebuild CS with the "
                         "USE_OPENSSL environment variable set."
                     )
+            return
+        try:
+            import inspect
+            import objgraph
+        except ImportError:
+            pass
+        if 'inspect' in locals():
+            namespace['ins'] = inspect
+        if 'objgraph' in locals():
+            namespace['og'] = objgraph
+        from pprint import pprint
+        namespace.update({
+            'pp': pprint,
+            'cfg': config,
+        })
+        portOffset = 0 if config.LogID == '' else int(config.LogID) + 1
+        portString = "tcp:%d:interface=127.0.0.1" % (
+            config.Manhole.StartingPortNumber + portOffset,
+        )
+        manholeService = manholeMakeService({
+            "passwd": config.Manhole.PasswordFilePath,
+            "telnetPort":
+                portString if config.Manhole.UseSSH is False else None,
+            "sshPort":
+                portString if config.Manhole.UseSSH is True else None,
+            "sshKeyDir": config.DataRoot,
+            "sshKeyName": config.Manhole.sshKeyName,
+            "sshKeySize": config.Manhole.sshKeySize,
+            "namespace": namespace,
+        })
+        manholeService.setName("manhole")
+        if parent is not None:
+            manholeService.setServiceParent(parent)
+        # Using print(because logging isn't ready at this point)
+        print("Manhole access enabled:", portString)
 
     def makeService_Single(self, options):
         """
@@ -1344,27 +1854,7 @@ class CalDAVServiceMaker (object):
 
             result = self.requestProcessingService(options, store, logObserver)
 
-            # Optionally set up push notifications
-            pushDistributor = None
-            if config.Notifications.Enabled:
-                observers = []
-                if config.Notifications.Services.APNS.Enabled:
-                    pushSubService = ApplePushNotifierService.makeService(
-                        config.Notifications.Services.APNS, store
-                    )
-                    observers.append(pushSubService)
-                    pushSubService.setName("APNS")
-                    pushSubService.setServiceParent(result)
-                if config.Notifications.Services.AMP.Enabled:
-                    pushSubService = AMPPushMaster(
-                        None, result,
-                        config.Notifications.Services.AMP.Port,
-                        config.Notifications.Services.AMP.EnableStaggering,
-                        config.Notifications.Services.AMP.StaggerSeconds,
-                    )
-                    observers.append(pushSubService)
-                if observers:
-                    pushDistributor = PushDistributor(observers)
+            pushDistributor = self._setupPushDistributor(result, store)
 
             directory = store.directoryService()
 
@@ -1379,66 +1869,46 @@ class CalDAVServiceMaker (object):
             store.queuer = store.pool = pool
             pool.setServiceParent(result)
 
-            # Optionally set up mail retrieval
-            if config.Scheduling.iMIP.Enabled:
-                mailRetriever = MailRetriever(
-                    store, directory, config.Scheduling.iMIP.Receiving
-                )
-                mailRetriever.setName("mailRetriever")
-                mailRetriever.setServiceParent(result)
-            else:
-                mailRetriever = None
+            mailRetriever = self._setupMailRetriever(result, store, directory)
 
             # Start listening on the stats socket, for administrators to inspect
             # the current stats on the server.
             stats = None
-            if config.Stats.EnableUnixStatsSocket:
+            if (
+                config.Stats.EnableUnixStatsSocket or
+                config.Stats.EnableTCPStatsSocket
+            ):
+                # One DashboardServer serves both listeners
                 stats = DashboardServer(logObserver, None)
                 stats.store = store
+            if config.Stats.EnableUnixStatsSocket:
                 statsService = GroupOwnedUNIXServer(
                     gid, config.Stats.UnixStatsSocket, stats, mode=0660
                 )
                 statsService.setName("unix-stats")
                 statsService.setServiceParent(result)
             if config.Stats.EnableTCPStatsSocket:
-                stats = DashboardServer(logObserver, None)
-                stats.store = store
                 statsService = TCPServer(
                     config.Stats.TCPStatsPort, stats, interface=""
                 )
                 statsService.setName("tcp-stats")
                 statsService.setServiceParent(result)
 
-            # Optionally set up group cacher
-            if config.GroupCaching.Enabled:
-                cacheNotifier = MemcacheURLPatternChangeNotifier("/principals/__uids__/{token}/", cacheHandle="PrincipalToken") if config.EnableResponseCache else None
-                groupCacher = GroupCacher(
-                    directory,
-                    updateSeconds=config.GroupCaching.UpdateSeconds,
-                    initialSchedulingDelaySeconds=config.GroupCaching.InitialSchedulingDelaySeconds,
-                    batchSize=config.GroupCaching.BatchSize,
-                    batchSchedulingIntervalSeconds=config.GroupCaching.BatchSchedulingIntervalSeconds,
-                    useDirectoryBasedDelegates=config.GroupCaching.UseDirectoryBasedDelegates,
-                    cacheNotifier=cacheNotifier,
-                )
-            else:
-                groupCacher = None
-
-            def decorateTransaction(txn):
-                txn._pushDistributor = pushDistributor
-                txn._rootResource = result.rootResource
-                txn._mailRetriever = mailRetriever
-                txn._groupCacher = groupCacher
+            groupCacher = self._setupGroupCacher(directory)
 
-            store.callWithNewTransactions(decorateTransaction)
+            self._installTransactionDecorator(
+                store, pushDistributor, result.rootResource, mailRetriever,
+                groupCacher
+            )
 
             return result
 
-        uid, gid = getSystemIDs(config.UserName, config.GroupName)
+        uid, gid = _cachedSystemIDs(config.UserName, config.GroupName)
 
         # Make sure no old socket files are lying around.
-        self.deleteStaleSocketFiles()
-        logObserver = RotatingFileAccessLoggingObserver(
+        if config.ControlSocket or config.Stats.EnableUnixStatsSocket:
+            self.deleteStaleSocketFiles()
+        logObserver = AsyncAccessLoggingObserver(
             config.AccessLogFile,
         )
 
@@ -1462,7 +1932,7 @@ class CalDAVServiceMaker (object):
         def toolServiceCreator(pool, store, ignored, storageService):
             return config.UtilityServiceClass(store)
 
-        uid, gid = getSystemIDs(config.UserName, config.GroupName)
+        uid, gid = _cachedSystemIDs(config.UserName, config.GroupName)
         return self.storageService(
             toolServiceCreator, None, uid=uid, gid=gid
         )
@@ -1507,7 +1977,7 @@ class CalDAVServiceMaker (object):
                 store.queuer = NonPerformingQueuer()
             return makeAgentService(store)
 
-        uid, gid = getSystemIDs(config.UserName, config.GroupName)
+        uid, gid = _cachedSystemIDs(config.UserName, config.GroupName)
         svc = self.storageService(
             agentServiceCreator, None, uid=uid, gid=gid
         )
@@ -1556,6 +2026,22 @@ class CalDAVServiceMaker (object):
         @rtype: L{IService}
         """
 
+        # The upgrade steps are only needed here; importing them lazily keeps
+        # them out of worker processes, which never run the upgrades
+        from twistedcaldav.upgrade import (
+            UpgradeFileSystemFormatStep, PostDBImportStep,
+        )
+        from txdav.common.datastore.upgrade.migrate import (
+            UpgradeToDatabaseStep
+        )
+        from txdav.common.datastore.upgrade.sql.upgrade import (
+            UpgradeDatabaseCalendarDataStep, UpgradeDatabaseOtherStep,
+            UpgradeDatabaseSchemaStep, UpgradeDatabaseAddressBookDataStep,
+            UpgradeAcquireLockStep, UpgradeReleaseLockStep,
+            UpgradeDatabaseNotificationDataStep, UpgradeFastPathCheckStep,
+            UpgradeStepGroup
+        )
+
         def createSubServiceFactory(dbtype, dbfeatures=()):
             if dbtype == "":
                 dialect = POSTGRES_DIALECT
@@ -1587,66 +2073,78 @@ class CalDAVServiceMaker (object):
                 # the subsequent steps' stepWithFailure methods will be called
                 # instead, until one of them returns a non-Failure.
 
-                pps.addStep(
-                    UpgradeAcquireLockStep(store)
+                fileStore = UpgradeToDatabaseStep.fileStoreFromPath(
+                    CachingFilePath(config.DocumentRoot)
                 )
-
-                # Still need this for Snow Leopard support
-                pps.addStep(
-                    UpgradeFileSystemFormatStep(config, store)
+                postImportStep = PostDBImportStep(
+                    store, config, getattr(self, "doPostImport", True)
                 )
 
-                pps.addStep(
-                    UpgradeDatabaseSchemaStep(
-                        store, uid=overrideUID, gid=overrideGID,
-                        failIfUpgradeNeeded=config.FailIfUpgradeNeeded,
-                        checkExistingSchema=config.CheckExistingSchema,
-                    )
-                )
-
-                pps.addStep(
-                    UpgradeDatabaseAddressBookDataStep(
-                        store, uid=overrideUID, gid=overrideGID
-                    )
-                )
+                # The whole upgrade-chain policy lives in this one list.
+                upgradeSteps = [
+                    UpgradeAcquireLockStep(store),
+                ]
 
-                pps.addStep(
-                    UpgradeDatabaseCalendarDataStep(
-                        store, uid=overrideUID, gid=overrideGID
+                # When the database is already fully up to date, the steps
+                # below still cost a transaction each just to discover there
+                # is nothing to do.  Check every version key in a single
+                # transaction and jump straight to post-import processing
+                # when the store is current.  Skipping is unsafe when there
+                # is file-store data to merge or the operator asked for
+                # explicit schema checking.
+                if (
+                    fileStore is None and
+                    not config.MergeUpgrades and
+                    not config.CheckExistingSchema
+                ):
+                    upgradeSteps.append(
+                        UpgradeFastPathCheckStep(
+                            store, pps, resumeStep=postImportStep
+                        )
                     )
-                )
 
-                pps.addStep(
-                    UpgradeDatabaseNotificationDataStep(
-                        store, uid=overrideUID, gid=overrideGID
-                    )
-                )
+                upgradeSteps.extend([
+                    # Still need this for Snow Leopard support
+                    UpgradeFileSystemFormatStep(config, store),
+
+                    # The schema and data version checks share one read-only
+                    # transaction; any step actually needing an upgrade still
+                    # runs standalone with its own transaction handling.
+                    UpgradeStepGroup(
+                        store,
+                        UpgradeDatabaseSchemaStep(
+                            store, uid=overrideUID, gid=overrideGID,
+                            failIfUpgradeNeeded=config.FailIfUpgradeNeeded,
+                            checkExistingSchema=config.CheckExistingSchema,
+                        ),
+                        UpgradeDatabaseAddressBookDataStep(
+                            store, uid=overrideUID, gid=overrideGID
+                        ),
+                        UpgradeDatabaseCalendarDataStep(
+                            store, uid=overrideUID, gid=overrideGID
+                        ),
+                        UpgradeDatabaseNotificationDataStep(
+                            store, uid=overrideUID, gid=overrideGID
+                        ),
+                    ),
 
-                pps.addStep(
                     UpgradeToDatabaseStep(
-                        UpgradeToDatabaseStep.fileStoreFromPath(
-                            CachingFilePath(config.DocumentRoot)
-                        ),
+                        fileStore,
                         store, uid=overrideUID, gid=overrideGID,
                         merge=config.MergeUpgrades
-                    )
-                )
+                    ),
 
-                pps.addStep(
                     UpgradeDatabaseOtherStep(
                         store, uid=overrideUID, gid=overrideGID
-                    )
-                )
+                    ),
 
-                pps.addStep(
-                    PostDBImportStep(
-                        store, config, getattr(self, "doPostImport", True)
-                    )
-                )
+                    postImportStep,
 
-                pps.addStep(
-                    UpgradeReleaseLockStep(store)
-                )
+                    UpgradeReleaseLockStep(store),
+                ])
+
+                for step in upgradeSteps:
+                    pps.addStep(step)
 
                 pps.setName("pre")
                 pps.setServiceParent(ms)
@@ -1712,38 +2210,24 @@ class CalDAVServiceMaker (object):
         if not preFlightChecks(config):
             return s
 
+        # Warm the import graph the slaves are about to load.
+        _preloadSlaveModules()
+
         # Add a service to re-exec the master when it receives SIGHUP
         ReExecService(config.PIDFile).setServiceParent(s)
 
         # Make sure no old socket files are lying around.
-        self.deleteStaleSocketFiles()
+        if config.ControlSocket or config.Stats.EnableUnixStatsSocket:
+            self.deleteStaleSocketFiles()
 
         # The logger service must come before the monitor service, otherwise
         # we won't know which logging port to pass to the slaves' command lines
 
         logger = AMPLoggingFactory(
-            RotatingFileAccessLoggingObserver(config.AccessLogFile)
+            AsyncAccessLoggingObserver(config.AccessLogFile)
         )
 
-        if config.GroupName:
-            try:
-                gid = getgrnam(config.GroupName).gr_gid
-            except KeyError:
-                raise ConfigurationError(
-                    "Invalid group name: {}".format(config.GroupName)
-                )
-        else:
-            gid = getgid()
-
-        if config.UserName:
-            try:
-                uid = getpwnam(config.UserName).pw_uid
-            except KeyError:
-                raise ConfigurationError(
-                    "Invalid user name: {}".format(config.UserName)
-                )
-        else:
-            uid = getuid()
+        uid, gid = _cachedSystemIDs(config.UserName, config.GroupName)
 
         controlSocket = ControlSocket()
         controlSocket.addFactory(_LOG_ROUTE, logger)
@@ -1756,6 +2240,7 @@ class CalDAVServiceMaker (object):
             config.Notifications.Enabled and
             config.Notifications.Services.AMP.Enabled
         ):
+            from calendarserver.push.amppush import AMPPushMaster
             ampSettings = config.Notifications.Services.AMP
             AMPPushMaster(
                 controlSocket,
@@ -1764,9 +2249,10 @@ class CalDAVServiceMaker (object):
                 ampSettings["EnableStaggering"],
                 ampSettings["StaggerSeconds"]
             )
-        if config.ControlSocket:
+        controlSocketPath = _controlSocketPath()
+        if controlSocketPath:
             controlSocketService = GroupOwnedUNIXServer(
-                gid, config.ControlSocket, controlSocket, mode=0660
+                gid, controlSocketPath, controlSocket, mode=0660
             )
         else:
             controlSocketService = ControlPortTCPServer(
@@ -1797,11 +2283,18 @@ class CalDAVServiceMaker (object):
         # Maybe spawn memcached through a ProcessMonitor
         self._spawnMemcached(monitor=monitor)
 
+        # Bind the config subtrees consulted repeatedly below to locals;
+        # every config.X is a ConfigDict __getattr__ call.
+        useMetaFD = config.UseMetaFD
+        socketFiles = config.SocketFiles
+        statsSettings = config.Stats
+        listenBacklog = config.ListenBacklog
+
         # Open the socket(s) to be inherited by the slaves
         inheritFDs = []
         inheritSSLFDs = []
 
-        if config.UseMetaFD:
+        if useMetaFD:
             cl = ConnectionLimiter(config.MaxAccepts,
                                    (config.MaxRequests *
                                     config.MultiProcess.ProcessCount))
@@ -1811,22 +2304,33 @@ class CalDAVServiceMaker (object):
             s._inheritedSockets = []
             dispatcher = None
 
-        if config.SocketFiles.Enabled:
-            if config.SocketFiles.Secured:
+            # With SO_REUSEPORT every slave binds its own listening socket
+            # and the kernel spreads accepts across them, so the master
+            # opens nothing here; without it, the master opens the sockets
+            # and all slaves accept from one shared queue per port.
+            reusePort = config.UseReusePort and _reusePortAvailable()
+            if config.UseReusePort and not reusePort:
+                log.warn(
+                    "UseReusePort is enabled but SO_REUSEPORT is not "
+                    "available here; slaves will share listening sockets"
+                )
+
+        if socketFiles.Enabled:
+            if socketFiles.Secured:
                 # TLS-secured requests will arrive via this Unix domain socket file
                 cl.addSocketFileService(
-                    "SSL", config.SocketFiles.Secured, config.ListenBacklog
+                    "SSL", socketFiles.Secured, listenBacklog
                 )
-            if config.SocketFiles.Unsecured:
+            if socketFiles.Unsecured:
                 # Unsecured requests will arrive via this Unix domain socket file
                 cl.addSocketFileService(
-                    "TCP", config.SocketFiles.Unsecured, config.ListenBacklog
+                    "TCP", socketFiles.Unsecured, listenBacklog
                 )
 
         else:
+            self._validatePortConfig()
             for bindAddress in self._allBindAddresses():
-                self._validatePortConfig()
-                if config.UseMetaFD:
+                if useMetaFD:
                     portsList = [(config.BindHTTPPorts, "TCP")]
                     if config.EnableSSL:
                         portsList.append((config.BindSSLPorts, "SSL"))
@@ -1834,19 +2338,17 @@ class CalDAVServiceMaker (object):
                         for port in ports:
                             cl.addPortService(
                                 description, port, bindAddress,
-                                config.ListenBacklog
+                                listenBacklog
                             )
-                else:
+                elif not reusePort:
                     def _openSocket(addr, port):
                         log.info(
                             "Opening socket for inheritance at {address}:{port}",
                             address=addr, port=port
                         )
-                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                        sock.setblocking(0)
-                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                        sock.bind((addr, port))
-                        sock.listen(config.ListenBacklog)
+                        sock = _openListeningSocket(
+                            addr, port, listenBacklog
+                        )
                         s._inheritedSockets.append(sock)
                         return sock
 
@@ -1862,18 +2364,18 @@ class CalDAVServiceMaker (object):
         # Start listening on the stats socket, for administrators to inspect
         # the current stats on the server.
         stats = None
-        if config.Stats.EnableUnixStatsSocket:
-            stats = DashboardServer(logger.observer, cl if config.UseMetaFD else None)
+        if statsSettings.EnableUnixStatsSocket:
+            stats = DashboardServer(logger.observer, cl if useMetaFD else None)
             statsService = GroupOwnedUNIXServer(
-                gid, config.Stats.UnixStatsSocket, stats, mode=0660
+                gid, statsSettings.UnixStatsSocket, stats, mode=0660
             )
             statsService.setName("unix-stats")
             statsService.setServiceParent(s)
 
-        elif config.Stats.EnableTCPStatsSocket:
-            stats = DashboardServer(logger.observer, cl if config.UseMetaFD else None)
+        elif statsSettings.EnableTCPStatsSocket:
+            stats = DashboardServer(logger.observer, cl if useMetaFD else None)
             statsService = TCPServer(
-                config.Stats.TCPStatsPort, stats, interface=""
+                statsSettings.TCPStatsPort, stats, interface=""
             )
             statsService.setName("tcp-stats")
             statsService.setServiceParent(s)
@@ -1886,7 +2388,7 @@ class CalDAVServiceMaker (object):
         # to), and second, the service which does an upgrade from the
         # filesystem to the database (if that's necessary, and there is
         # filesystem data in need of upgrading).
-        def spawnerSvcCreator(pool, store, ignored, storageService):
+        def spawnerSvcCreator(connectionPool, store, ignored, storageService):
             if store is None:
                 raise StoreNotAvailable()
 
@@ -1911,9 +2413,9 @@ class CalDAVServiceMaker (object):
             # rid of the connection dispenser and make a shared / async
             # connection pool implementation that can dispense transactions
             # synchronously as the interface requires.
-            if pool is not None and config.SharedConnectionPool:
+            if connectionPool is not None and config.SharedConnectionPool:
                 self.log.warn("Using Shared Connection Pool")
-                dispenser = ConnectionDispenser(pool)
+                dispenser = ConnectionDispenser(connectionPool)
             else:
                 dispenser = None
             multi = MultiService()
@@ -1925,44 +2427,18 @@ class CalDAVServiceMaker (object):
             )
             spawner.setName("spawner")
             spawner.setServiceParent(multi)
-            if config.UseMetaFD:
+            if useMetaFD:
                 cl.setServiceParent(multi)
 
             directory = store.directoryService()
             rootResource = getRootResource(config, store, [])
 
-            # Optionally set up mail retrieval
-            if config.Scheduling.iMIP.Enabled:
-                mailRetriever = MailRetriever(
-                    store, directory, config.Scheduling.iMIP.Receiving
-                )
-                mailRetriever.setName("MailRetriever")
-                mailRetriever.setServiceParent(multi)
-            else:
-                mailRetriever = None
-
-            # Optionally set up group cacher
-            if config.GroupCaching.Enabled:
-                cacheNotifier = MemcacheURLPatternChangeNotifier("/principals/__uids__/{token}/", cacheHandle="PrincipalToken") if config.EnableResponseCache else None
-                groupCacher = GroupCacher(
-                    directory,
-                    updateSeconds=config.GroupCaching.UpdateSeconds,
-                    initialSchedulingDelaySeconds=config.GroupCaching.InitialSchedulingDelaySeconds,
-                    batchSize=config.GroupCaching.BatchSize,
-                    batchSchedulingIntervalSeconds=config.GroupCaching.BatchSchedulingIntervalSeconds,
-                    useDirectoryBasedDelegates=config.GroupCaching.UseDirectoryBasedDelegates,
-                    cacheNotifier=cacheNotifier,
-                )
-            else:
-                groupCacher = None
-
-            def decorateTransaction(txn):
-                txn._pushDistributor = None
-                txn._rootResource = rootResource
-                txn._mailRetriever = mailRetriever
-                txn._groupCacher = groupCacher
+            mailRetriever = self._setupMailRetriever(multi, store, directory)
+            groupCacher = self._setupGroupCacher(directory)
 
-            store.callWithNewTransactions(decorateTransaction)
+            self._installTransactionDecorator(
+                store, None, rootResource, mailRetriever, groupCacher
+            )
 
             return multi
 
@@ -1975,42 +2451,65 @@ class CalDAVServiceMaker (object):
 
     def deleteStaleSocketFiles(self):
 
-        # Check all socket files we use.
-        for checkSocket in [
-            config.ControlSocket, config.Stats.UnixStatsSocket
-        ]:
-            # See if the file exists.
-            if (exists(checkSocket)):
-                # See if the file represents a socket.  If not, delete it.
-                if (not S_ISSOCK(stat(checkSocket).st_mode)):
-                    self.log.warn(
-                        "Deleting stale socket file (not a socket): {socket}",
-                        socket=checkSocket
-                    )
-                    remove(checkSocket)
-                else:
-                    # It looks like a socket.
-                    # See if it's accepting connections.
+        # Check all socket files we use, skipping ones not in play so we
+        # do not stat() paths nothing will ever bind.
+        checkSockets = []
+        if config.ControlSocket:
+            checkSockets.append(config.ControlSocket)
+        if config.Stats.EnableUnixStatsSocket:
+            checkSockets.append(config.Stats.UnixStatsSocket)
+        for checkSocket in checkSockets:
+            # One lstat() answers both "does it exist" and "is it a
+            # socket".
+            try:
+                checkSocketMode = lstat(checkSocket).st_mode
+            except OSError:
+                continue
+            # See if the file represents a socket.  If not, delete it.
+            if (not S_ISSOCK(checkSocketMode)):
+                self.log.warn(
+                    "Deleting stale socket file (not a socket): {socket}",
+                    socket=checkSocket
+                )
+                remove(checkSocket)
+            else:
+                # It looks like a socket.
+                # See if it's accepting connections.  Use a fresh
+                # non-blocking socket per port (a socket can only be
+                # connected once) with a short select() timeout, and
+                # stop as soon as any port answers - one success is
+                # enough to know the server is live.
+                connected = False
+                testPorts = [config.HTTPPort, config.SSLPort]
+                for testPort in testPorts:
                     tmpSocket = socket.socket(
                         socket.AF_INET, socket.SOCK_STREAM
                     )
-                    numConnectFailures = 0
-                    testPorts = [config.HTTPPort, config.SSLPort]
-                    for testPort in testPorts:
-                        try:
-                            tmpSocket.connect(("127.0.0.1", testPort))
-                            tmpSocket.shutdown(2)
-                        except:
-                            numConnectFailures = numConnectFailures + 1
-                    # If the file didn't connect on any expected ports,
-                    # consider it stale and remove it.
-                    if numConnectFailures == len(testPorts):
-                        self.log.warn(
-                            "Deleting stale socket file "
-                            "(not accepting connections): {socket}",
-                            socket=checkSocket
+                    try:
+                        tmpSocket.setblocking(0)
+                        tmpSocket.connect_ex(("127.0.0.1", testPort))
+                        _ignore_r, writable, _ignore_x = select.select(
+                            [], [tmpSocket], [], 0.2
                         )
-                        remove(checkSocket)
+                        if writable and tmpSocket.getsockopt(
+                            socket.SOL_SOCKET, socket.SO_ERROR
+                        ) == 0:
+                            connected = True
+                    except socket.error:
+                        pass
+                    finally:
+                        tmpSocket.close()
+                    if connected:
+                        break
+                # If the file didn't connect on any expected ports,
+                # consider it stale and remove it.
+                if not connected:
+                    self.log.warn(
+                        "Deleting stale socket file "
+                        "(not accepting connections): {socket}",
+                        socket=checkSocket
+                    )
+                    remove(checkSocket)
 
 
 class TwistdSlaveProcess(object):
@@ -2076,6 +2575,27 @@ class TwistdSlaveProcess(object):
         self.ampSQLDispenser = ampSQLDispenser
         self.ampDBSocket = None
 
+        # The part of the command line that never changes for this slave,
+        # built on first use and reused on every respawn.
+        self._staticArgs = None
+
+        # The identity mapping for the fixed inherited fds never changes;
+        # getFileDescriptors copies it and adds the per-spawn fds.
+        self._baseFDs = dict(
+            (fd, fd) for fd in self.inheritSSLFDs + self.inheritFDs
+        )
+
+        # The fd lists never change either; build the full option
+        # strings once.
+        self._inheritFDsArg = (
+            "InheritFDs=" + ",".join(map(str, self.inheritFDs))
+            if self.inheritFDs else None
+        )
+        self._inheritSSLFDsArg = (
+            "InheritSSLFDs=" + ",".join(map(str, self.inheritSSLFDs))
+            if self.inheritSSLFDs else None
+        )
+
     def starting(self):
         """
         Called when the process is being started (or restarted). Allows for
@@ -2125,24 +2645,25 @@ class TwistdSlaveProcess(object):
         @return: a mapping of file descriptor numbers for the new (child)
             process to file descriptor numbers in the current (master) process.
         """
-        fds = {}
-        extraFDs = []
+        fds = dict(self._baseFDs)
         if self.metaSocket is not None:
-            extraFDs.append(self.metaSocket.childSocket().fileno())
+            fd = self.metaSocket.childSocket().fileno()
+            fds[fd] = fd
         if self.ampSQLDispenser is not None:
             self.ampDBSocket = self.ampSQLDispenser.dispense()
-            extraFDs.append(self.ampDBSocket.fileno())
-        for fd in self.inheritSSLFDs + self.inheritFDs + extraFDs:
+            fd = self.ampDBSocket.fileno()
             fds[fd] = fd
         return fds
 
-    def getCommandLine(self):
+    def _buildStaticArgs(self):
         """
-        @return: a list of command-line arguments, including the executable to
-            be used to start this subprocess.
-
-        @rtype: C{list} of C{str}
+        Build the fixed part of the command line: everything except the
+        arguments that name per-spawn file descriptors.
         """
+        # Bind the config subtrees we poke at repeatedly to locals;
+        # ConfigDict attribute access goes through __getattr__ each time.
+        profiling = config.Profiling
+
         args = [sys.executable, self.twistd]
 
         if config.UserName:
@@ -2151,9 +2672,9 @@ class TwistdSlaveProcess(object):
         if config.GroupName:
             args.extend(("-g", config.GroupName))
 
-        if config.Profiling.Enabled:
+        if profiling.Enabled:
             args.append("--profile={}/{}.pstats".format(
-                config.Profiling.BaseDirectory, self.getName()
+                profiling.BaseDirectory, self.getName()
             ))
             args.extend(("--savestats", "--profiler", "cprofile-cpu"))
 
@@ -2172,30 +2693,33 @@ class TwistdSlaveProcess(object):
             ),
             "-o", "ControlPort={:d}".format(config.ControlPort),
         ])
+        return args
 
-        if self.inheritFDs:
-            args.extend([
-                "-o", "InheritFDs={}".format(
-                    ",".join(map(str, self.inheritFDs))
-                )
-            ])
+    def getCommandLine(self):
+        """
+        @return: a list of command-line arguments, including the executable to
+            be used to start this subprocess.
 
-        if self.inheritSSLFDs:
-            args.extend([
-                "-o", "InheritSSLFDs={}".format(
-                    ",".join(map(str, self.inheritSSLFDs))
-                )
-            ])
+        @rtype: C{list} of C{str}
+        """
+        if self._staticArgs is None:
+            self._staticArgs = self._buildStaticArgs()
+        args = list(self._staticArgs)
+
+        if self._inheritFDsArg is not None:
+            args.extend(["-o", self._inheritFDsArg])
+
+        if self._inheritSSLFDsArg is not None:
+            args.extend(["-o", self._inheritSSLFDsArg])
 
         if self.metaSocket is not None:
             args.extend([
-                "-o", "MetaFD={}".format(
-                    self.metaSocket.childSocket().fileno()
-                )
+                "-o",
+                "MetaFD=%d" % (self.metaSocket.childSocket().fileno(),)
             ])
         if self.ampDBSocket is not None:
             args.extend([
-                "-o", "DBAMPFD={}".format(self.ampDBSocket.fileno())
+                "-o", "DBAMPFD=%d" % (self.ampDBSocket.fileno(),)
             ])
         return args
 
@@ -2238,17 +2762,28 @@ class DelayedStartupProcessMonitor(Service, object):
     minRestartDelay = 1
     maxRestartDelay = 3600
 
+    # How often the single scheduling timer scans for due restarts and
+    # murders; restart and kill deadlines are rounded up to the next scan.
+    scanInterval = 0.25
+
+    # Pipes every child gets; copied (never mutated in place) per spawn.
+    _baseChildFDs = {0: "w", 1: "r", 2: "r"}
+
     def __init__(self, reactor=None):
         super(DelayedStartupProcessMonitor, self).__init__()
         if reactor is None:
             from twisted.internet import reactor
         self._reactor = reactor
-        self.processes = OrderedDict()
+        self.processes = {}
+        self._order = []
         self.protocols = {}
         self.delay = {}
         self.timeStarted = {}
         self.murder = {}
-        self.restart = {}
+        self._restartDue = {}
+        self._scheduler = None
+        self._startQueue = deque()
+        self._startTimer = None
         self.stopping = False
         if config.MultiProcess.StaggeredStartup.Enabled:
             self.delayInterval = config.MultiProcess.StaggeredStartup.Interval
@@ -2310,6 +2845,7 @@ class DelayedStartupProcessMonitor(Service, object):
         """
         name = process.getName()
         self.processes[name] = (process, env, uid, gid)
+        self._order.append(name)
         self.delay[name] = self.minRestartDelay
         if self.running:
             self.startProcess(name)
@@ -2318,9 +2854,15 @@ class DelayedStartupProcessMonitor(Service, object):
         # Now we're ready to build the command lines and actually add the
         # processes to procmon.
         super(DelayedStartupProcessMonitor, self).startService()
-        # This will be in the order added, since self.processes is an
-        # OrderedDict
-        for name in self.processes:
+
+        # One timer services every pending restart and murder deadline,
+        # rather than a reactor callLater per process.
+        self._scheduler = LoopingCall(self._scanDueTimers)
+        self._scheduler.clock = self._reactor
+        self._scheduler.start(self.scanInterval, now=False)
+
+        # Start in the order the processes were added.
+        for name in self._order:
             self.startProcess(name)
 
     def stopService(self):
@@ -2329,20 +2871,42 @@ class DelayedStartupProcessMonitor(Service, object):
         """
         self.stopping = True
         self.deferreds = {}
+        # Only processes with a live protocol will reach processEnded; a
+        # Deferred for one that already exited would never fire and hang
+        # the gatherResults below.
         for name in self.processes:
-            self.deferreds[name] = Deferred()
+            if name in self.protocols:
+                self.deferreds[name] = Deferred()
         super(DelayedStartupProcessMonitor, self).stopService()
 
-        # Cancel any outstanding restarts
-        for name, delayedCall in self.restart.items():
-            if delayedCall.active():
-                delayedCall.cancel()
+        # Cancel any outstanding restarts and queued first starts; the
+        # scheduler itself must keep running until the last murder
+        # deadline has been serviced.
+        self._restartDue.clear()
+        self._startQueue.clear()
+        if self._startTimer is not None:
+            if self._startTimer.active():
+                self._startTimer.cancel()
+            self._startTimer = None
 
         # Stop processes in the reverse order from which they were added and
         # started
-        for name in reversed(self.processes):
+        for name in reversed(self._order):
             self.stopProcess(name)
-        return gatherResults(self.deferreds.values())
+
+        d = gatherResults(list(self.deferreds.values()))
+
+        # Once every child has ended there are no deadlines left to scan,
+        # so stop the scheduler with the service rather than leaving a
+        # pending call until its next tick; this also covers the case of
+        # no live children at all, where d has already fired.
+        def _stopScheduler(result):
+            if self._scheduler is not None and self._scheduler.running:
+                self._scheduler.stop()
+            return result
+
+        d.addBoth(_stopScheduler)
+        return d
 
     def removeProcess(self, name):
         """
@@ -2354,6 +2918,7 @@ class DelayedStartupProcessMonitor(Service, object):
         """
         self.stopProcess(name)
         del self.processes[name]
+        self._order.remove(name)
 
     def stopProcess(self, name):
         """
@@ -2363,16 +2928,18 @@ class DelayedStartupProcessMonitor(Service, object):
             raise KeyError("Unrecognized process name: {}".format(name))
 
         proto = self.protocols.get(name, None)
-        if proto is not None:
-            proc = proto.transport
-            try:
-                proc.signalProcess('TERM')
-            except ProcessExitedAlready:
-                pass
-            else:
-                self.murder[name] = self._reactor.callLater(
-                    self.killTime, self._forceStopProcess, proc
-                )
+        if proto is None:
+            # Already dead; nothing to signal and no murder timer needed.
+            return
+        proc = proto.transport
+        try:
+            proc.signalProcess('TERM')
+        except ProcessExitedAlready:
+            pass
+        else:
+            self.murder[name] = (
+                self._reactor.seconds() + self.killTime, proc
+            )
 
     def processEnded(self, name):
         """
@@ -2382,12 +2949,9 @@ class DelayedStartupProcessMonitor(Service, object):
         Also make sure to signal the dispatcher so that the socket is
         marked as inactive.
         """
-        # Cancel the scheduled _forceStopProcess function if the process
-        # dies naturally
-        if name in self.murder:
-            if self.murder[name].active():
-                self.murder[name].cancel()
-            del self.murder[name]
+        # Drop the pending _forceStopProcess deadline if the process dies
+        # naturally
+        self.murder.pop(name, None)
 
         self.processes[name][0].stopped()
 
@@ -2406,9 +2970,7 @@ class DelayedStartupProcessMonitor(Service, object):
 
         # Schedule a process restart if the service is running
         if self.running and name in self.processes:
-            self.restart[name] = self._reactor.callLater(nextDelay,
-                                                         self.startProcess,
-                                                         name)
+            self._restartDue[name] = self._reactor.seconds() + nextDelay
         if self.stopping:
             deferred = self.deferreds.pop(name, None)
             if deferred is not None:
@@ -2423,6 +2985,23 @@ class DelayedStartupProcessMonitor(Service, object):
         except ProcessExitedAlready:
             pass
 
+    def _scanDueTimers(self):
+        """
+        Run every pending restart and murder whose deadline has passed.
+        This is driven by a single L{LoopingCall} so that a crash storm
+        across many slaves does not put one timed call per process into
+        the reactor.
+        """
+        now = self._reactor.seconds()
+        for name, due in self._restartDue.items():
+            if due <= now:
+                del self._restartDue[name]
+                self.startProcess(name)
+        for name, (due, proc) in self.murder.items():
+            if due <= now:
+                del self.murder[name]
+                self._forceStopProcess(proc)
+
     def signalAll(self, signal, startswithname=None):
         """
         Send a signal to all child processes.
@@ -2433,9 +3012,15 @@ class DelayedStartupProcessMonitor(Service, object):
             whose name starts with this string
         @type signal: C{str}
         """
-        for name in self.processes.keys():
+        # Iterate the live protocols directly; dead processes have no
+        # transport to signal and signalProcess would just re-do the
+        # lookup per name.
+        for name, proto in self.protocols.items():
             if startswithname is None or name.startswith(startswithname):
-                self.signalProcess(signal, name)
+                try:
+                    proto.transport.signalProcess(signal)
+                except ProcessExitedAlready:
+                    pass
 
     def signalProcess(self, signal, name):
         """
@@ -2469,8 +3054,7 @@ class DelayedStartupProcessMonitor(Service, object):
         procObj, env, uid, gid = self.processes[name]
         self.timeStarted[name] = time.time()
 
-        childFDs = {0: "w", 1: "r", 2: "r"}
-
+        childFDs = dict(self._baseChildFDs)
         childFDs.update(procObj.getFileDescriptors())
 
         procObj.starting()
@@ -2482,8 +3066,6 @@ class DelayedStartupProcessMonitor(Service, object):
             childFDs=childFDs
         )
 
-    _pendingStarts = 0
-
     def startProcess(self, name):
         """
         Start process named 'name'.  If another process has started recently,
@@ -2491,14 +3073,29 @@ class DelayedStartupProcessMonitor(Service, object):
 
         @param name: the name of the process to start.
         """
-        interval = (self.delayInterval * self._pendingStarts)
-        self._pendingStarts += 1
-
-        def delayedStart():
-            self._pendingStarts -= 1
+        if self.delayInterval == 0:
+            # No stagger configured: spawn the whole batch right away
+            # instead of queueing one reactor turn per slave.
             self.reallyStartProcess(name)
+            return
+        # One timer drains the queue at delayInterval, instead of
+        # pre-scheduling a callLater per queued process.
+        self._startQueue.append(name)
+        if self._startTimer is None:
+            self._startTimer = self._reactor.callLater(0, self._drainStarts)
 
-        self._reactor.callLater(interval, delayedStart)
+    def _drainStarts(self):
+        """
+        Start the next queued process and reschedule while any remain.
+        """
+        name = self._startQueue.popleft()
+        self.reallyStartProcess(name)
+        if self._startQueue:
+            self._startTimer = self._reactor.callLater(
+                self.delayInterval, self._drainStarts
+            )
+        else:
+            self._startTimer = None
 
     def restartAll(self):
         """
@@ -2507,27 +3104,26 @@ class DelayedStartupProcessMonitor(Service, object):
         change in circumstances -- for example, a new version of a library is
         installed.
         """
-        for name in self.processes:
+        # Snapshot the ordering so a process removed while we signal the
+        # others cannot perturb the iteration.
+        for name in tuple(self._order):
             self.stopProcess(name)
 
     def __repr__(self):
-        l = []
-
-        for name, (procObj, uid, gid, _ignore_env) in self.processes.items():
-            uidgid = ''
-            if uid is not None:
-                uidgid = str(uid)
-            if gid is not None:
-                uidgid += ':' + str(gid)
-
-            if uidgid:
-                uidgid = '(' + uidgid + ')'
-            l.append("{}{}: {}".format(name, uidgid, procObj))
-
-        return (
-            "<{self.__class__.__name__} {l}>"
-            .format(self=self, l=" ".join(l))
-        )
+        parts = []
+
+        for name in self._order:
+            procObj, _ignore_env, uid, gid = self.processes[name]
+            if uid is None and gid is None:
+                uidgid = ''
+            else:
+                uidgid = '({}{})'.format(
+                    uid if uid is not None else '',
+                    ':{}'.format(gid) if gid is not None else ''
+                )
+            parts.append("{}{}: {}".format(name, uidgid, procObj))
+
+        return "<{} {}>".format(self.__class__.__name__, " ".join(parts))
 
 
 class DelayedStartupLineLogger(object):
@@ -2548,9 +3144,15 @@ class DelayedStartupLineLogger(object):
         pass
 
     def dataReceived(self, data):
-        lines = (self._buffer + data).split("\n")
-        while len(lines) > 1:
-            line = lines.pop(0)
+        # Scan for newlines in place instead of splitting the whole
+        # accumulated buffer into a list and popping it from the front,
+        # which went quadratic under heavy child output.
+        if self._buffer:
+            data = self._buffer + data
+        pos = 0
+        nl = data.find("\n")
+        while nl >= 0:
+            line = data[pos:nl]
             if len(line) > self.MAX_LENGTH:
                 self.lineLengthExceeded(line)
             elif self.exceeded:
@@ -2558,7 +3160,9 @@ class DelayedStartupLineLogger(object):
                 self.exceeded = False
             else:
                 self.lineReceived(line)
-        lastLine = lines.pop(0)
+            pos = nl + 1
+            nl = data.find("\n", pos)
+        lastLine = data[pos:]
         if len(lastLine) > self.MAX_LENGTH:
             self.lineLengthExceeded(lastLine)
             self.exceeded = True
@@ -2589,22 +3193,19 @@ class DelayedStartupLineLogger(object):
         @type line: C{str}
         @return: array of C{str}
         """
-        length = len(line)
-
-        numSegments = (
-            length / self.MAX_LENGTH +
-            (1 if length % self.MAX_LENGTH else 0)
-        )
-
-        segments = []
+        maxLength = self.MAX_LENGTH
+        numSegments, remainder = divmod(len(line), maxLength)
+        if remainder:
+            numSegments += 1
 
-        for i in range(numSegments):
-            msg = line[i * self.MAX_LENGTH:(i + 1) * self.MAX_LENGTH]
+        segments = [None] * numSegments
 
-            if i < numSegments - 1:  # not the last segment
-                msg += self.CONTINUED_TEXT
-
-            segments.append(msg)
+        for i in xrange(numSegments - 1):
+            segments[i] = (
+                line[i * maxLength:(i + 1) * maxLength] + self.CONTINUED_TEXT
+            )
+        if numSegments:
+            segments[numSegments - 1] = line[(numSegments - 1) * maxLength:]
 
         return segments
 
@@ -2616,7 +3217,7 @@ class DelayedStartupLoggingProtocol(ProcessProtocol):
 
     service = None
     name = None
-    empty = 1
+    output = None
 
     def connectionMade(self):
         """
@@ -2629,7 +3230,6 @@ class DelayedStartupLoggingProtocol(ProcessProtocol):
 
     def outReceived(self, data):
         self.output.dataReceived(data)
-        self.empty = data[-1] == '\n'
 
     errReceived = outReceived
 
@@ -2637,7 +3237,9 @@ class DelayedStartupLoggingProtocol(ProcessProtocol):
         """
         Let the service know that this child process has ended
         """
-        if not self.empty:
+        # The line logger's buffer is non-empty exactly when the child
+        # died mid-line; flush the partial line out.
+        if self.output is not None and self.output._buffer:
             self.output.dataReceived('\n')
         self.service.processEnded(self.name)
 
@@ -2679,6 +3281,28 @@ def getSystemIDs(userName, groupName):
     return uid, gid
 
 
+# Resolved ids are cached for a few minutes: the lookups can hit remote
+# directory services (LDAP/SSSD) and the same names are resolved by every
+# service build, while a TTL keeps long-running masters from missing NSS
+# changes entirely.
+_SYSTEM_IDS_CACHE = {}
+_SYSTEM_IDS_TTL = 300
+
+
+def _cachedSystemIDs(userName, groupName):
+    """
+    Memoizing wrapper around L{getSystemIDs}.
+    """
+    key = (userName, groupName)
+    now = time.time()
+    cached = _SYSTEM_IDS_CACHE.get(key)
+    if cached is not None and now - cached[0] < _SYSTEM_IDS_TTL:
+        return cached[1]
+    ids = getSystemIDs(userName, groupName)
+    _SYSTEM_IDS_CACHE[key] = (now, ids)
+    return ids
+
+
 class DataStoreMonitor(object):
     implements(IDirectoryChangeListenee)
 
@@ -2690,17 +3314,13 @@ class DataStoreMonitor(object):
         self._reactor = reactor
         self._storageService = storageService
 
-    def disconnected(self):
-        self._storageService.hardStop()
-        self._reactor.stop()
-
-    def deleted(self):
+    def _shutdown(self):
         self._storageService.hardStop()
         self._reactor.stop()
 
-    def renamed(self):
-        self._storageService.hardStop()
-        self._reactor.stop()
+    # All the change notifications mean the same thing to us: the data
+    # store is gone, so stop.
+    disconnected = deleted = renamed = _shutdown
 
     def connectionLost(self, reason):
         pass
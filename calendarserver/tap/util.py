@@ -1094,6 +1094,21 @@ class Stepper(object):
         self.failure = None
         self.result = None
         self.running = False
+        self._shortCircuitResume = None
+
+    def shortCircuit(self, resumeStep=None):
+        """
+        Called by a running step to mark the remaining steps as satisfied, so
+        that execution jumps ahead without calling their stepWithResult()
+        methods.
+
+        @param resumeStep: the step at which normal execution should resume;
+            if C{None}, everything but the final step is skipped.
+        @type resumeStep: an object previously passed to addStep(), or C{None}
+        """
+        self._shortCircuitResume = (
+            resumeStep if resumeStep is not None else self.steps[-1]
+        )
 
     def addStep(self, step):
         """
@@ -1109,6 +1124,20 @@ class Stepper(object):
         self.steps.append(step)
         return self
 
+    def _skippableStep(self, step):
+        """
+        Wrap a step's stepWithResult so that it is passed over when an
+        earlier step has called shortCircuit().
+        """
+        def runStep(result):
+            resume = self._shortCircuitResume
+            if resume is not None:
+                if step is not resume:
+                    return succeed(result)
+                self._shortCircuitResume = None
+            return step.stepWithResult(result)
+        return runStep
+
     def defaultStepWithResult(self, result):
         return succeed(result)
 
@@ -1136,7 +1165,7 @@ class Stepper(object):
 
             # See if we need to use a default implementation of the step methods:
             if hasattr(step, "stepWithResult"):
-                callBack = step.stepWithResult
+                callBack = self._skippableStep(step)
                 # callBack = self.protectStep(step.stepWithResult)
             else:
                 callBack = self.defaultStepWithResult
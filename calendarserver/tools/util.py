@@ -153,12 +153,16 @@ def checkDirectory(dirpath, description, access=None, create=None, wait=False):
                 from calendarserver.tap.util import AlertPoster
                 AlertPoster.postAlert("MissingDataVolumeAlert", 0, ["volumePath", dirpath])
 
+            # Poll with exponential backoff (50 ms doubling up to a 2 second
+            # cap) so startup resumes promptly if the volume appears mid-poll
+            delay = 0.05
             while not os.path.exists(dirpath) or (diagnose.detectPhantomVolume(dirpath) == diagnose.EXIT_CODE_PHANTOM_DATA_VOLUME):
                 if not os.path.exists(dirpath):
                     print("Path does not exist: %s" % (dirpath,))
                 else:
                     print("Path is not a real volume: %s" % (dirpath,))
-                sleep(5)
+                sleep(delay)
+                delay = min(2.0, delay * 2)
         else:
             try:
                 mode, username, groupname = create
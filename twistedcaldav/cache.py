@@ -20,7 +20,8 @@ from txweb2.http import Response
 from txweb2.iweb import IResource
 from txweb2.stream import MemoryStream
 
-from twisted.internet.defer import succeed, inlineCallbacks, returnValue
+from twisted.internet.defer import Deferred, succeed, inlineCallbacks, \
+    returnValue
 
 from twistedcaldav.config import config
 from twistedcaldav.memcachepool import CachePoolUserMixIn, defaultCachePool
@@ -165,6 +166,63 @@ class MemcacheURLPatternChangeNotifier(CachePoolUserMixIn):
         )
 
 
+# Counter bumped by MemcacheGenerationalChangeNotifier to invalidate every
+# cached response whose principal token embedded an older generation.
+PRINCIPAL_TOKEN_GENERATION_KEY = "principalTokenGeneration"
+
+
+class MemcacheGenerationalChangeNotifier(CachePoolUserMixIn):
+    """
+    A change notifier which invalidates a whole class of cached responses at
+    once by bumping a single generation counter, rather than rewriting one
+    token per affected resource.  The counter value is embedded in the
+    tokens stored with each cache entry, so one INCR is enough no matter how
+    many principals a change affects.
+    """
+    log = Logger()
+
+    def __init__(self, generationKey, cachePool=None, cacheHandle="Default"):
+        self._generationKey = generationKey
+        self._cachePool = cachePool
+        self._cachePoolHandle = cacheHandle
+        self._bumpPending = False
+
+    def changed(self, token=None):
+        """
+        Bump the generation counter.  Callers like GroupCacher notify once
+        per affected principal, so calls arriving while a bump is already
+        scheduled are folded into it.
+
+        @param token: ignored; the generation covers every principal
+        @type token: L{str}
+
+        return: A L{Deferred} that fires when the counter has been bumped.
+        """
+        if self._bumpPending:
+            return succeed(None)
+        self._bumpPending = True
+
+        from twisted.internet import reactor
+        d = Deferred()
+
+        def _bump():
+            self._bumpPending = False
+            self.log.debug(
+                "Bumping cache generation {key}", key=self._generationKey
+            )
+            bumped = self.getCachePool().incr(self._generationKey)
+            # incr fails if the counter does not exist yet; create it
+            bumped.addErrback(
+                lambda ignored: self.getCachePool().add(
+                    self._generationKey, "1"
+                )
+            )
+            bumped.chainDeferred(d)
+
+        reactor.callLater(0, _bump)
+        return d
+
+
 class BaseResponseCache(object):
     """
     A base class which provides some common operations
@@ -290,6 +348,30 @@ class MemcacheResponseCache(BaseResponseCache, CachePoolUserMixIn):
             _ignore_flags, result = result
         returnValue(result)
 
+    @inlineCallbacks
+    def _principalToken(self, pURI):
+        """
+        Get the current token for a principal URI, combined with the
+        principal generation counter when one exists so that a single INCR
+        by L{MemcacheGenerationalChangeNotifier} invalidates every
+        principal's cached responses at once.
+        """
+        token = (yield self._tokenForURI(pURI, "PrincipalToken"))
+        try:
+            pool = defaultCachePool("PrincipalToken")
+        except KeyError:
+            # No pools installed (e.g. unit tests with a stubbed cache)
+            returnValue(token)
+        result = (yield pool.get(PRINCIPAL_TOKEN_GENERATION_KEY))
+        if result is not None:
+            _ignore_flags, generation = result
+        else:
+            generation = None
+        if generation is None:
+            # Counter not created yet; the plain token is sufficient
+            returnValue(token)
+        returnValue((token, generation,))
+
     @inlineCallbacks
     def _tokenForRecord(self, uri, request):
         """
@@ -319,7 +401,7 @@ class MemcacheResponseCache(BaseResponseCache, CachePoolUserMixIn):
         """
         tokens = []
         pURI, rURI = (yield self._getURIs(request))
-        tokens.append((yield self._tokenForURI(pURI, "PrincipalToken")))
+        tokens.append((yield self._principalToken(pURI)))
         tokens.append((yield self._tokenForRecord(pURI, request)))
         tokens.append((yield self._tokenForURI(rURI)))
         tokens.append((yield self._tokensForChildren(rURI, request)))
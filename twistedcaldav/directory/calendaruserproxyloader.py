@@ -24,7 +24,7 @@ __all__ = [
 
 import types
 
-from twisted.internet.defer import inlineCallbacks
+from twisted.internet.defer import inlineCallbacks, returnValue
 
 from twext.python.log import Logger
 
@@ -101,30 +101,41 @@ class XMLCalendarUserProxyLoader(object):
                 raise RuntimeError("Invalid record '%s' without a guid in proxies file: '%s'" % (child, self.xmlFile,))
 
             if repeat > 1:
+                # Scan for "%" templates once per record rather than once
+                # per member on every repeat iteration.
+                staticWrite, templateWrite = self._partitionMembers(write_proxies)
+                staticRead, templateRead = self._partitionMembers(read_proxies)
+                guidIsTemplate = type(guid) in types.StringTypes and "%" in guid
                 for i in xrange(1, repeat + 1):
-                    self._buildRecord(guid, write_proxies, read_proxies, i)
+                    self.items.append((
+                        guid % (i,) if guidIsTemplate else guid,
+                        self._expandMembers(staticWrite, templateWrite, i),
+                        self._expandMembers(staticRead, templateRead, i),
+                    ))
             else:
-                self._buildRecord(guid, write_proxies, read_proxies)
+                self.items.append((guid, frozenset(write_proxies), frozenset(read_proxies),))
 
     def _parseMembers(self, node, addto):
         for child in node:
             if child.tag == ELEMENT_MEMBER:
                 addto.add(child.text)
 
-    def _buildRecord(self, guid, write_proxies, read_proxies, count=None):
-
-        def expandCount(value, count):
-
-            if type(value) in types.StringTypes:
-                return value % (count,) if count and "%" in value else value
+    def _partitionMembers(self, members):
+        static = set()
+        templates = []
+        for member in members:
+            if type(member) in types.StringTypes and "%" in member:
+                templates.append(member)
             else:
-                return value
-
-        guid = expandCount(guid, count)
-        write_proxies = set([expandCount(member, count) for member in write_proxies])
-        read_proxies = set([expandCount(member, count) for member in read_proxies])
+                static.add(member)
+        return frozenset(static), templates
 
-        self.items.append((guid, write_proxies, read_proxies,))
+    def _expandMembers(self, static, templates, count):
+        # A record with no templates can share the one immutable member
+        # set across all of its repeated instances.
+        if not templates:
+            return static
+        return static.union(template % (count,) for template in templates)
 
     @inlineCallbacks
     def updateProxyDB(self, db):
@@ -145,20 +156,32 @@ class XMLCalendarUserProxyLoader(object):
 
         directory = store.directoryService()
         txn = store.newTransaction(label="xmlDelegatesToStore")
+
+        # The same UID typically shows up as a proxy in many records, and
+        # in every instance of a repeated record; look each one up in the
+        # directory at most once.
+        records = {}
+
+        @inlineCallbacks
+        def lookupRecord(uid):
+            if uid not in records:
+                records[uid] = yield directory.recordWithUID(uid)
+            returnValue(records[uid])
+
         for item in self.items:
             guid, write_proxies, read_proxies = item
-            delegatorRecord = yield directory.recordWithUID(guid)
+            delegatorRecord = yield lookupRecord(guid)
             if delegatorRecord is None:
                 continue
             for proxy in write_proxies:
-                delegateRecord = yield directory.recordWithUID(proxy)
+                delegateRecord = yield lookupRecord(proxy)
                 if delegateRecord is None:
                     continue
 
                 yield Delegates.addDelegate(txn, delegatorRecord, delegateRecord, True)
 
             for proxy in read_proxies:
-                delegateRecord = yield directory.recordWithUID(proxy)
+                delegateRecord = yield lookupRecord(proxy)
                 if delegateRecord is None:
                     continue
 
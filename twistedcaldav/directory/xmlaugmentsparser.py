@@ -63,6 +63,31 @@ ELEMENT_AUGMENTRECORD_MAP = {
 }
 
 
+def _textValue(node):
+    return node.text if node.text else ""
+
+
+def _booleanValue(node):
+    return node.text == VALUE_TRUE
+
+
+# Hashed dispatch on the element name, instead of a linear scan of two
+# membership tuples per child node.
+ELEMENT_VALUE_PARSERS = {
+    ELEMENT_UID: _textValue,
+    ELEMENT_SERVERID: _textValue,
+    ELEMENT_PARTITIONID: _textValue,
+    ELEMENT_HOSTEDAT: _textValue,
+    ELEMENT_AUTOSCHEDULE_MODE: _textValue,
+    ELEMENT_AUTOACCEPTGROUP: _textValue,
+    ELEMENT_ENABLE: _booleanValue,
+    ELEMENT_ENABLECALENDAR: _booleanValue,
+    ELEMENT_ENABLEADDRESSBOOK: _booleanValue,
+    ELEMENT_ENABLELOGIN: _booleanValue,
+    ELEMENT_AUTOSCHEDULE: _booleanValue,
+}
+
+
 class XMLAugmentsParser(object):
     """
     XML augments configuration file parser.
@@ -99,53 +124,44 @@ class XMLAugmentsParser(object):
             fields = {}
             for node in child:
 
-                if node.tag in (
-                    ELEMENT_UID,
-                    ELEMENT_SERVERID,
-                    ELEMENT_PARTITIONID,
-                    ELEMENT_HOSTEDAT,
-                    ELEMENT_AUTOSCHEDULE_MODE,
-                    ELEMENT_AUTOACCEPTGROUP,
-                ):
-                    fields[node.tag] = node.text if node.text else ""
-                elif node.tag in (
-                    ELEMENT_ENABLE,
-                    ELEMENT_ENABLECALENDAR,
-                    ELEMENT_ENABLEADDRESSBOOK,
-                    ELEMENT_ENABLELOGIN,
-                    ELEMENT_AUTOSCHEDULE,
-                ):
-                    fields[node.tag] = node.text == VALUE_TRUE
-                else:
+                valueParser = ELEMENT_VALUE_PARSERS.get(node.tag)
+                if valueParser is None:
                     raise RuntimeError("Invalid element '%s' in augment file: '%s'" % (node.tag, self.xmlFile,))
+                fields[node.tag] = valueParser(node)
 
             # Must have at least a uid
             if ELEMENT_UID not in fields:
                 raise RuntimeError("Invalid record '%s' without a uid in augment file: '%s'" % (child, self.xmlFile,))
 
+            # Partition the fields into fixed values and "%" templates
+            # once, rather than re-scanning every value on each repeat
+            # iteration.
+            staticFields = {}
+            templateFields = []
+            for k, v in fields.iteritems():
+                if k in ELEMENT_AUGMENTRECORD_MAP:
+                    mapped = ELEMENT_AUGMENTRECORD_MAP[k]
+                    if type(v) in types.StringTypes and "%" in v:
+                        templateFields.append((mapped, v))
+                    else:
+                        staticFields[mapped] = v
+
             if repeat > 1:
-                for i in xrange(1, repeat + 1):
-                    self.buildRecord(fields, i)
+                # Build all the repeated records first and insert them in
+                # one C-level dict.update() rather than one assignment per
+                # repeat iteration.
+                records = [self.buildRecord(staticFields, templateFields, i) for i in xrange(1, repeat + 1)]
+                self.items.update((record.uid, record) for record in records)
             else:
-                self.buildRecord(fields)
+                record = self.buildRecord(staticFields, templateFields)
+                self.items[record.uid] = record
 
-    def buildRecord(self, fields, count=None):
+    def buildRecord(self, staticFields, templateFields, count=None):
 
         from twistedcaldav.directory.augment import AugmentRecord
 
-        def expandCount(value, count):
-
-            if type(value) in types.StringTypes:
-                return value % (count,) if count and "%" in value else value
-            elif type(value) == set:
-                return set([item % (count,) if count and "%" in item else item for item in value])
-            else:
-                return value
-
-        actualFields = {}
-        for k, v in fields.iteritems():
-            if k in ELEMENT_AUGMENTRECORD_MAP:
-                actualFields[ELEMENT_AUGMENTRECORD_MAP[k]] = expandCount(v, count)
+        actualFields = staticFields.copy()
+        for k, template in templateFields:
+            actualFields[k] = template % (count,) if count else template
 
-        record = AugmentRecord(**actualFields)
-        self.items[record.uid] = record
+        return AugmentRecord(**actualFields)
@@ -203,6 +203,11 @@ DEFAULT_CONFIG = {
     "UseMetaFD": True,  # Use a 'meta' FD, i.e. an FD to transmit other FDs to slave processes.
     "MetaFD": 0,  # Inherited file descriptor to call recvmsg() on to receive sockets (none = don't inherit)
 
+    "UseReusePort": False,  # With UseMetaFD off, have each slave bind its own
+                            # SO_REUSEPORT listening socket (the master opens none)
+                            # so the kernel distributes accepts instead of all
+                            # slaves sharing one inherited accept queue.
+
     #
     # Database configuration information.
     #
@@ -515,6 +520,8 @@ DEFAULT_CONFIG = {
             "Enabled": False,
             "Interval": 15,
         },
+        "MergeStderr": False,  # Dup each slave's stderr onto its stdout pipe,
+                               # halving the log pipes the master must service
     },
 
     # How large a spawned process is allowed to get before it's stopped
@@ -856,6 +863,7 @@ DEFAULT_CONFIG = {
     "Notifications": {
         "Enabled": False,
         "CoalesceSeconds": 3,
+        "CoalesceMS": 0,  # In-memory coalescing window for the push distributor; 0 disables batching
 
         "Services": {
             "APNS": {
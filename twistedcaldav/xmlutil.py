@@ -17,11 +17,18 @@
 from __future__ import with_statement
 
 import cStringIO as StringIO
-import xml.etree.ElementTree as XML
+import mmap
 
+# The C accelerated parser builds the same Element API without a Python
+# object per node visited during the parse.
 try:
-    from xml.etree.ElementTree import ParseError as XMLParseError
+    import xml.etree.cElementTree as XML
 except ImportError:
+    import xml.etree.ElementTree as XML
+
+try:
+    XMLParseError = XML.ParseError
+except AttributeError:
     from xml.parsers.expat import ExpatError as XMLParseError
 
 
@@ -32,13 +39,33 @@ def readXMLString(xmldata, expectedRootTag=None):
     return readXML(io, expectedRootTag)
 
 
+def _readXMLFromPath(xmlpath):
+    """
+    Parse the file at the given path by mmap'ing it and feeding the whole
+    buffer to the parser in one go, letting expat scan the page cache
+    directly instead of copying the file through Python read() buffers.
+    """
+    with open(xmlpath, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, EnvironmentError):
+            # Zero-length or unmappable; let the regular path report it.
+            return XML.ElementTree(file=xmlpath)
+        try:
+            parser = XML.XMLParser()
+            parser.feed(mm)
+            return XML.ElementTree(parser.close())
+        finally:
+            mm.close()
+
+
 def readXML(xmlfile, expectedRootTag=None):
     """
     Read in XML data from a file and parse into ElementTree. Optionally verify
     the root node is what we expect.
 
-    @param xmlfile: file to read from
-    @type xmlfile: C{File}
+    @param xmlfile: file to read from, or the path of a file
+    @type xmlfile: C{File} or C{str}
     @param expectedRootTag: root tag (qname) to test or C{None}
     @type expectedRootTag: C{str}
     @return: C{tuple} of C{ElementTree}, C{Element}
@@ -46,7 +73,10 @@ def readXML(xmlfile, expectedRootTag=None):
 
     # Read in XML
     try:
-        etree = XML.ElementTree(file=xmlfile)
+        if isinstance(xmlfile, basestring):
+            etree = _readXMLFromPath(xmlfile)
+        else:
+            etree = XML.ElementTree(file=xmlfile)
     except XMLParseError, e:
         raise ValueError("Unable to parse file '%s' because: %s" % (xmlfile, e,))
 
@@ -86,7 +86,7 @@ from calendarserver.tools.util import displayNameForCollection, getEventDetails,
 
 from zope.interface import implements, directlyProvides
 
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 import datetime
 import inspect
 import itertools
@@ -100,6 +100,16 @@ current_sql_schema = getModule(__name__).filePath.sibling("sql_schema").child("c
 log = Logger()
 
 
+TransactionServices = namedtuple(
+    "TransactionServices",
+    ["pushDistributor", "rootResource", "mailRetriever", "groupCacher"]
+)
+"""
+The bundle of application-level services carried by every transaction as
+C{txn._services}; see L{CommonDataStore.setTransactionServices}.
+"""
+
+
 class CommonDataStore(Service, object):
     """
     Shared logic for SQL-based data stores, between calendar and addressbook
@@ -181,6 +191,7 @@ class CommonDataStore(Service, object):
         self._migrating = False
         self._enableNotifications = True
         self._newTransactionCallbacks = set()
+        self._txnServices = None
 
         if cacheQueries:
             self.queryCacher = QueryCacher(
@@ -218,6 +229,18 @@ class CommonDataStore(Service, object):
         """
         self._newTransactionCallbacks.add(callback)
 
+    def setTransactionServices(self, services):
+        """
+        Attach a bundle of application services to every new transaction as
+        a single C{txn._services} assignment. This is cheaper than a
+        L{callWithNewTransactions} callback making one attribute store per
+        service, which adds up when a transaction is opened per request.
+
+        @param services: the services every transaction should carry
+        @type services: L{TransactionServices}
+        """
+        self._txnServices = services
+
     @inlineCallbacks
     def _withEachHomeDo(self, homeTable, homeFromTxn, action, batchSize, processExternal=False):
         """
@@ -277,6 +300,8 @@ class CommonDataStore(Service, object):
         if self.logTransactionWaits or self.timeoutTransactions:
             CommonStoreTransactionMonitor(txn, self.logTransactionWaits,
                                           self.timeoutTransactions)
+        if self._txnServices is not None:
+            txn._services = self._txnServices
         for callback in self._newTransactionCallbacks:
             callback(txn)
         return txn
@@ -566,6 +591,10 @@ class CommonStoreTransaction(
 
     id = 0
 
+    # Default (empty) service bundle; replaced per-instance by
+    # L{CommonDataStore.setTransactionServices} or the setters below.
+    _services = TransactionServices(None, None, None, None)
+
     def __init__(
         self, store, sqlTxn,
         enableCalendars, enableAddressBooks,
@@ -649,6 +678,42 @@ class CommonStoreTransaction(
     def directoryService(self):
         return self._store.directoryService()
 
+    # Source-compatible shims for the individual services in the
+    # L{TransactionServices} bundle; the setters exist so tests can attach
+    # one service to a single transaction without building a whole bundle.
+
+    @property
+    def _pushDistributor(self):
+        return self._services.pushDistributor
+
+    @_pushDistributor.setter
+    def _pushDistributor(self, value):
+        self._services = self._services._replace(pushDistributor=value)
+
+    @property
+    def _rootResource(self):
+        return self._services.rootResource
+
+    @_rootResource.setter
+    def _rootResource(self, value):
+        self._services = self._services._replace(rootResource=value)
+
+    @property
+    def _mailRetriever(self):
+        return self._services.mailRetriever
+
+    @_mailRetriever.setter
+    def _mailRetriever(self, value):
+        self._services = self._services._replace(mailRetriever=value)
+
+    @property
+    def _groupCacher(self):
+        return self._services.groupCacher
+
+    @_groupCacher.setter
+    def _groupCacher(self, value):
+        self._services = self._services._replace(groupCacher=value)
+
     def __repr__(self):
         return 'PG-TXN<%s>' % (self._label,)
 
@@ -23,6 +23,7 @@
 #
 ##
 
+import array
 import time
 import warnings
 import socket
@@ -1159,18 +1160,41 @@ class HTTPLoggingChannelRequest(HTTPChannelRequest):
 HTTPChannel.chanRequestFactory = HTTPLoggingChannelRequest
 
 
-class LimitingHTTPFactory(HTTPFactory):
+class LimitingHTTPFactory(HTTPFactory, object):
     """
     HTTPFactory which stores maxAccepts on behalf of the MaxAcceptPortMixin
 
+    The two limits live in a C int array, with properties keeping the plain
+    attribute names working, so the per-accept checks (and the config-reload
+    hook that rewrites the limits) are single array-item operations rather
+    than instance dict traffic.  The explicit C{object} base makes the class
+    new-style so the property setters actually run.
+
     @ivar myServer: a reference to a L{MaxAcceptTCPServer} that this
         L{LimitingHTTPFactory} will limit.  This must be set externally.
     """
 
     def __init__(self, requestFactory, maxRequests=600, maxAccepts=100, **kwargs):
+        self._limits = array.array("i", [0, 0])
         HTTPFactory.__init__(self, requestFactory, maxRequests, **kwargs)
         self.maxAccepts = maxAccepts
 
+    @property
+    def maxRequests(self):
+        return self._limits[0]
+
+    @maxRequests.setter
+    def maxRequests(self, value):
+        self._limits[0] = value
+
+    @property
+    def maxAccepts(self):
+        return self._limits[1]
+
+    @maxAccepts.setter
+    def maxAccepts(self, value):
+        self._limits[1] = value
+
     def buildProtocol(self, addr):
         """
         Override L{HTTPFactory.buildProtocol} in order to avoid ever returning